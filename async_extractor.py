@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مستخرج منتجات سوق الجملة غير المتزامن - asyncio
+يسمح باستخراج عشرات المتاجر في عملية واحدة مع مشاركة منطق التحليل
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, List, Dict, Iterable, Optional, Tuple
+
+from dependencies import MissingDependencyError, is_available, require
+from extractor import DEFAULT_HEADERS, WholesaleProductExtractor
+from throttle import parse_retry_after
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# aiohttp يُحمّل عند إنشاء المستخرج فقط
+AIOHTTP_AVAILABLE = is_available('aiohttp')
+
+# أكواد الحالة التي تستحق إعادة المحاولة
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class AsyncWholesaleProductExtractor(WholesaleProductExtractor):
+    """مستخرج غير متزامن بعميل HTTP مشترك يعيد استخدام الاتصالات"""
+    
+    def __init__(self, max_connections: int = 50, max_connections_per_host: int = 8,
+                 timeout: float = 30, retries: int = 2, retry_backoff: float = 1.0, **kwargs):
+        self._aiohttp = require('aiohttp')
+        super().__init__(**kwargs)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._client = None
+    
+    async def __aenter__(self):
+        self._get_client()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    def _get_client(self) -> 'aiohttp.ClientSession':
+        """إنشاء عميل HTTP مشترك عند أول استخدام"""
+        aiohttp = self._aiohttp
+        if self._client is None or self._client.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=60
+            )
+            headers = {k: v for k, v in DEFAULT_HEADERS.items() if k.lower() != 'connection'}
+            self._client = aiohttp.ClientSession(
+                connector=connector,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """إغلاق العميل وتحرير الاتصالات، ثم إغلاق المتصفحات وحفظ ملفات المحددات والذاكرة المؤقتة"""
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+        await asyncio.get_running_loop().run_in_executor(None, super().close)
+    
+    async def _aget(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict, bytes]:
+        """طلب GET مع إعادة المحاولة عند الأخطاء المؤقتة واحترام Retry-After، ويعيد (الحالة، الترويسات، المحتوى)"""
+        aiohttp = self._aiohttp
+        client = self._get_client()
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                async with client.get(url, headers=headers) as response:
+                    if response.status not in RETRY_STATUSES or attempt >= self.retries:
+                        response.raise_for_status()
+                        return response.status, response.headers, await response.read()
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                # أخطاء الشبكة المؤقتة فقط؛ الرابط غير الصالح وأكواد الحالة الأخرى تفشل فوراً
+                if attempt >= self.retries:
+                    raise
+            self.metrics.inc('retries')
+            await asyncio.sleep(max(self.retry_backoff * (2 ** attempt), retry_after or 0))
+    
+    async def _afetch(self, url: str) -> Tuple[bytes, bool]:
+        """تحميل الصفحة مع طلب شرطي عند تفعيل الذاكرة المؤقتة، ويعيد (المحتوى، لم يتغير)"""
+        loop = asyncio.get_running_loop()
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+        with self.metrics.timer('fetch'):
+            status, response_headers, content = await self._aget(url, headers)
+            
+            if status == 304 and self.cache:
+                body = await loop.run_in_executor(None, self.cache.get_body, url)
+                if body is not None:
+                    self.cache.record_hit(url)
+                    self.metrics.inc('not_modified_pages')
+                    return body, True
+                # المحتوى المحفوظ مفقود، نعيد التحميل بدون شروط
+                status, response_headers, content = await self._aget(url)
+        
+        self.metrics.inc('fetched_bytes', len(content))
+        if self.cache:
+            self.cache.record_miss(url)
+            await loop.run_in_executor(None, self.cache.store, url, response_headers, content)
+        return content, False
+    
+    async def aextract_from_souq_gomla(self, url: str, use_selenium: bool = False) -> List[Dict]:
+        """استخراج منتجات من سوق الجملة بشكل غير متزامن"""
+        self._log(f"بدء استخراج منتجات سوق الجملة من: {url}")
+        
+        loop = asyncio.get_running_loop()
+        if use_selenium:
+            return await loop.run_in_executor(None, self._extract_with_selenium, url)
+        
+        try:
+            content, not_modified = await self._afetch(url)
+            # التحليل (وصفحات محولات المواقع الإضافية) في خيط منفصل حتى لا يعطل التحميلات الأخرى
+            return await loop.run_in_executor(None, self._extract_from_content, url, content, not_modified)
+        except MissingDependencyError:
+            raise
+        except Exception as e:
+            self._log(f"خطأ في الاستخراج غير المتزامن: {e}")
+            self.metrics.inc('errors', backend='async')
+            if not self.demo_fallback:
+                raise
+            return self._get_demo_products()
+    
+    async def extract_many(self, urls: Iterable[str], use_selenium: bool = False) -> Dict[str, List[Dict]]:
+        """استخراج عدة متاجر بالتوازي"""
+        urls = list(urls)
+        results = await asyncio.gather(*(self.aextract_from_souq_gomla(url, use_selenium) for url in urls))
+        return dict(zip(urls, results))
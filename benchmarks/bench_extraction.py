@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قياس أداء مسار الاستخراج بدون شبكة
+يقيس المنتجات في الثانية وذروة الذاكرة لكل صفحة ولكل محلل HTML ويحفظ النتائج بصيغة JSON
+
+الاستخدام:
+    python benchmarks/bench_extraction.py --out bench_results.json
+    python benchmarks/bench_extraction.py --sizes 20,1000 --fixture saved_page.html
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bs4  # noqa: E402
+from extractor import LXML_AVAILABLE, WholesaleProductExtractor  # noqa: E402
+from fixtures import nested_fallback_page, product_cards_page  # noqa: E402
+
+BASE_URL = 'https://souqgomlaa.almatjar.store/ar/shop'
+
+def build_fixtures(sizes: List[int], nested_size: int, files: List[str]) -> List[Tuple[str, bytes]]:
+    """الصفحات الاصطناعية والمحفوظة"""
+    fixtures = [(f'cards_{size}', product_cards_page(size).encode('utf-8')) for size in sizes]
+    if nested_size:
+        fixtures.append((f'nested_fallback_{nested_size}', nested_fallback_page(nested_size).encode('utf-8')))
+    for path in files:
+        with open(path, 'rb') as f:
+            fixtures.append((os.path.basename(path), f.read()))
+    return fixtures
+
+def _run_once(extractor: WholesaleProductExtractor, content: bytes) -> Tuple[float, float, int]:
+    start = time.perf_counter()
+    soup = extractor._make_soup(content)
+    parsed = time.perf_counter()
+    products = extractor._parse_products_from_soup(soup, BASE_URL, limit=None)
+    return parsed - start, time.perf_counter() - parsed, len(products)
+
+def bench(name: str, content: bytes, parser: str, repeat: int) -> Dict:
+    """قياس صفحة واحدة بمحلل واحد (أفضل زمن من عدة تكرارات)"""
+    extractor = WholesaleProductExtractor(parser=parser, rate_limit=False, quiet=True)
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        timings.append(_run_once(extractor, content))
+    parse_seconds, extract_seconds, products = min(timings, key=lambda t: t[0] + t[1])
+    
+    # قياس الذاكرة في تشغيل منفصل لأن tracemalloc يبطئ التنفيذ
+    gc.collect()
+    tracemalloc.start()
+    _run_once(extractor, content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    total = parse_seconds + extract_seconds
+    return {
+        'fixture': name,
+        'parser': parser,
+        'bytes': len(content),
+        'products': products,
+        'parse_seconds': round(parse_seconds, 6),
+        'extract_seconds': round(extract_seconds, 6),
+        'total_seconds': round(total, 6),
+        'products_per_second': round(products / total, 1) if total else None,
+        'extract_products_per_second': round(products / extract_seconds, 1) if extract_seconds else None,
+        'peak_memory_mb': round(peak / (1024 * 1024), 2)
+    }
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ''
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='قياس أداء مسار الاستخراج بدون شبكة')
+    parser.add_argument('--sizes', default='20,1000,50000', help='أعداد بطاقات المنتجات مفصولة بفواصل')
+    parser.add_argument('--nested', type=int, default=1000, help='عدد المنتجات في صفحة العناصر المتداخلة (0 للتعطيل)')
+    parser.add_argument('--fixture', action='append', default=[], help='صفحة HTML محفوظة (يمكن تكراره)')
+    parser.add_argument('--parsers', default='html.parser,lxml', help='محللات HTML للمقارنة')
+    parser.add_argument('--repeat', type=int, default=3, help='عدد التكرارات لكل قياس')
+    parser.add_argument('--out', default='bench_results.json', help='ملف النتائج JSON')
+    args = parser.parse_args(argv)
+    
+    parsers = [p for p in args.parsers.split(',') if p != 'lxml' or LXML_AVAILABLE]
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    
+    results = []
+    for name, content in build_fixtures(sizes, args.nested, args.fixture):
+        for html_parser in parsers:
+            result = bench(name, content, html_parser, args.repeat)
+            results.append(result)
+            print(f"{name:<24} {html_parser:<12} {result['products']:>7} منتج  "
+                  f"{result['products_per_second']:>10} منتج/ث  {result['peak_memory_mb']:>8} MB")
+    
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'bs4': bs4.__version__,
+        'lxml_available': LXML_AVAILABLE,
+        'results': results
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"تم حفظ النتائج في {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+صفحات متاجر اصطناعية بأحجام مختلفة لقياس أداء التحليل بدون شبكة
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+def _product_card(i: int) -> str:
+    status = '<span class="badge">غير متوفر</span>' if i % 7 == 0 else '<button class="add-to-cart">أضف للسلة</button>'
+    return (
+        f'<div class="product-item" data-product-id="{1000 + i}">'
+        f'<a href="/ar/product/item-{i}"><img class="lazy" src="/assets/loader.svg" '
+        f'data-src="https://tager-uploads.s3.eu-central-1.amazonaws.com/{i:08d}.jpg"></a>'
+        f'<div class="product-body"><h3 class="product-title">عرض منتج رقم {i} - عبوة {i % 12 + 1} قطع</h3>'
+        f'<div class="product-meta"><span class="price">{100 + i % 900:,}.50 جنيه</span>'
+        f'<span class="old-price">{150 + i % 900} جنيه</span></div>{status}</div></div>'
+    )
+
+def product_cards_page(count: int) -> str:
+    """صفحة بعدد محدد من بطاقات المنتجات ذات الأصناف المعروفة"""
+    cards = ''.join(_product_card(i) for i in range(count))
+    return (
+        '<!DOCTYPE html><html lang="ar" dir="rtl"><head><meta charset="utf-8"><title>المتجر</title></head>'
+        f'<body><header><nav class="menu"><a href="/ar/shop">المتجر</a></nav></header>'
+        f'<main><section class="products-grid">{cards}</section>'
+        '<nav class="pagination"><a rel="next" href="/ar/shop?page=2">التالي</a></nav></main></body></html>'
+    )
+
+def nested_fallback_page(count: int, depth: int = 8) -> str:
+    """صفحة بدون أصناف منتجات معروفة وبعناصر متداخلة بعمق، تفعّل البحث عن الأسعار في النص"""
+    cards = []
+    for i in range(count):
+        inner = (
+            f'<img src="/media/{i}.jpg"><h4>صنف رقم {i}</h4>'
+            f'<p><span>السعر</span> {50 + i % 500} جنيه</p>'
+        )
+        for level in range(depth):
+            inner = f'<div class="wrap-{level}">{inner}</div>'
+        cards.append(f'<li>{inner}</li>')
+    return (
+        '<!DOCTYPE html><html lang="ar" dir="rtl"><head><meta charset="utf-8"></head><body>'
+        f'<div class="page"><div class="content"><ul class="grid">{"".join(cards)}</ul></div></div></body></html>'
+    )
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مجمع متصفحات Selenium قابلة لإعادة الاستخدام
+يحافظ على متصفحات Chrome جاهزة بين عمليات الاستخراج بدلاً من تشغيل متصفح جديد لكل رابط
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Optional
+
+from dependencies import MissingDependencyError, is_available
+
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.options import Options
+
+# Selenium يُستورد عند تشغيل أول متصفح فقط
+SELENIUM_AVAILABLE = is_available('selenium')
+
+def default_chrome_options() -> 'Options':
+    """إعدادات Chrome الافتراضية للتشغيل بدون واجهة"""
+    from selenium.webdriver.chrome.options import Options
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1366,768')
+    return chrome_options
+
+def _is_timeout(error: Exception) -> bool:
+    if not SELENIUM_AVAILABLE:
+        return False
+    from selenium.common.exceptions import TimeoutException
+    return isinstance(error, TimeoutException)
+
+class BrowserPool:
+    """مجمع متصفحات دافئة بحجم محدد مع إعادة تدوير المتصفح بعد عدد من الصفحات"""
+    
+    def __init__(self, size: int = 2, recycle_after: int = 50, driver_factory: Optional[Callable] = None,
+                 log: Callable[[str], None] = print):
+        if not SELENIUM_AVAILABLE and driver_factory is None:
+            raise MissingDependencyError('selenium', 'selenium')
+        
+        self.size = size
+        self.recycle_after = recycle_after
+        self.log = log
+        self._driver_factory = driver_factory or self._create_driver
+        self._idle = []
+        self._uses = {}
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+    
+    @staticmethod
+    def _create_driver():
+        """تشغيل متصفح Chrome جديد"""
+        from selenium import webdriver
+        return webdriver.Chrome(options=default_chrome_options())
+    
+    def acquire(self):
+        """الحصول على متصفح جاهز أو تشغيل متصفح جديد إذا لم يكتمل المجمع"""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("مجمع المتصفحات مغلق")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                self._cond.wait()
+        
+        try:
+            driver = self._driver_factory()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+        
+        with self._cond:
+            self._uses[id(driver)] = 0
+        return driver
+    
+    def release(self, driver, broken: bool = False):
+        """إعادة المتصفح إلى المجمع أو إغلاقه عند انتهاء عمره"""
+        with self._cond:
+            uses = self._uses.get(id(driver), 0) + 1
+            if not (broken or self._closed or uses >= self.recycle_after):
+                self._uses[id(driver)] = uses
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+            
+            self._uses.pop(id(driver), None)
+            self._created -= 1
+            self._cond.notify()
+        
+        self._quit(driver)
+    
+    @contextmanager
+    def driver(self):
+        """استعارة متصفح من المجمع خلال كتلة with"""
+        driver = self.acquire()
+        broken = False
+        try:
+            yield driver
+        except Exception as e:
+            # المتصفح قد يكون في حالة غير سليمة بعد خطأ غير متوقع (عدا انتهاء المهلة)
+            broken = not _is_timeout(e)
+            raise
+        finally:
+            self.release(driver, broken)
+    
+    def close(self):
+        """إغلاق جميع المتصفحات الخاملة ومنع الاستعارة الجديدة"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for driver in idle:
+                self._uses.pop(id(driver), None)
+                self._created -= 1
+            self._cond.notify_all()
+        
+        for driver in idle:
+            self._quit(driver)
+    
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            self.log(f"خطأ في إغلاق المتصفح: {e}")
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+فهرس استعلام سريع في الذاكرة لكتالوجات المنتجات المستخرجة
+يبني الفهارس مرة واحدة: خريطة بت للحالة، ترتيب الصفوف حسب السعر لاستعلامات النطاق،
+وفهرس كلمات ومقاطع ثلاثية للأسماء بعد توحيد النص العربي، مع حفظ وتحميل من ملف ثنائي مضغوط
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models import ProductStatus, as_dict
+from normalization import normalize_text
+
+MAGIC = b'WPCI'
+FORMAT_VERSION = 2
+NGRAM = 3
+TOKEN_RE = re.compile(r'\w+')
+# الكلمات الشائعة (في أكثر من 1/32 من الصفوف) تُحفظ كخرائط بت جاهزة
+FREQUENT_FRACTION = 32
+WORD_CACHE_SIZE = 1024
+
+# أسماء مختصرة للحالات كما في فلتر الواجهة الأمامية
+STATUS_ALIASES = {'available': ProductStatus.AVAILABLE.value, 'unavailable': ProductStatus.UNAVAILABLE.value}
+SORTS = (None, 'price', '-price', 'name', '-name')
+
+# أعمدة النصوص المحفوظة في الملف بالترتيب
+STRING_COLUMNS = ('code', 'name', 'image', 'currency', 'extracted_at', '_text')
+
+def _popcount(mask: int) -> int:
+    return mask.bit_count() if hasattr(mask, 'bit_count') else bin(mask).count('1')
+
+def _ngrams(word: str) -> Iterator[str]:
+    for i in range(len(word) - NGRAM + 1):
+        yield word[i:i + NGRAM]
+
+def _spans(size: int, step: int, reverse: bool) -> Iterable[int]:
+    starts = range(0, size, step)
+    return reversed(starts) if reverse else starts
+
+class _Postings:
+    """جدول قوائم صفوف مضغوط: مفتاح -> شريحة من مصفوفة واحدة"""
+    
+    def __init__(self, keys: List[str], offsets: array, rows: array):
+        self.keys = keys
+        self.offsets = offsets
+        self.rows = rows
+        self._slots = {key: i for i, key in enumerate(keys)}
+    
+    @classmethod
+    def build(cls, lists: Dict[str, List[int]]) -> '_Postings':
+        keys = sorted(lists)
+        offsets = array('I', [0])
+        rows = array('I')
+        for key in keys:
+            rows.extend(lists[key])
+            offsets.append(len(rows))
+        return cls(keys, offsets, rows)
+    
+    def get(self, key: str) -> Optional[array]:
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        return self.rows[self.offsets[slot]:self.offsets[slot + 1]]
+    
+    def size(self, key: str) -> int:
+        slot = self._slots.get(key)
+        return 0 if slot is None else self.offsets[slot + 1] - self.offsets[slot]
+
+class CatalogIndex:
+    """فهرس استعلام للكتالوج: بحث نصي وفلترة بالحالة والسعر وترتيب وتقسيم صفحات"""
+    
+    def __init__(self, products: Iterable):
+        records = [as_dict(p) for p in products]
+        # ترقيم الصفوف حسب السعر: نطاق السعر يصبح نطاقاً متصلاً من أرقام الصفوف
+        order = sorted(range(len(records)), key=lambda i: records[i]['price'])
+        records = [records[i] for i in order]
+        
+        self.columns = {field: [str(r[field]) for r in records]
+                        for field in ('code', 'name', 'image', 'currency', 'extracted_at')}
+        self.columns['_text'] = [normalize_text(f"{r['name']} {r['code']}") for r in records]
+        self.prices = array('d', (float(r['price']) for r in records))
+        self.source_order = array('I', order)
+        
+        self.statuses = sorted({str(r['status']) for r in records})
+        codes = {status: i for i, status in enumerate(self.statuses)}
+        self.status_codes = bytes(codes[str(r['status'])] for r in records)
+        
+        names = self.columns['_text']
+        self.name_order = array('I', sorted(range(len(records)), key=names.__getitem__))
+        
+        tokens = {}
+        for row, text in enumerate(names):
+            for word in set(TOKEN_RE.findall(text)):
+                tokens.setdefault(word, []).append(row)
+        self.tokens = _Postings.build(tokens)
+        self._finish()
+    
+    def _finish(self):
+        """بناء الهياكل المشتقة (خرائط البت وترتيب الأصل) بعد البناء أو التحميل"""
+        count = len(self.prices)
+        self._all = (1 << count) - 1
+        bits = [bytearray((count + 7) // 8) for _ in self.statuses]
+        for row, code in enumerate(self.status_codes):
+            bits[code][row >> 3] |= 1 << (row & 7)
+        self._status_masks = {status: int.from_bytes(bits[code], 'little')
+                              for code, status in enumerate(self.statuses)}
+        
+        # ترتيب الاسم لكل صف، والصفوف بترتيب الاستخراج الأصلي
+        self.name_rank = array('I', bytes(4 * count))
+        for rank, row in enumerate(self.name_order):
+            self.name_rank[row] = rank
+        self._source_rows = array('I', bytes(4 * count))
+        for row, source in enumerate(self.source_order):
+            self._source_rows[source] = row
+        
+        # المقاطع الثلاثية لمفردات الفهرس (أصغر بكثير من مقاطع جميع الصفوف): مقطع -> أرقام الكلمات
+        self._token_grams = {}
+        for slot, token in enumerate(self.tokens.keys):
+            for gram in set(_ngrams(token)):
+                self._token_grams.setdefault(gram, []).append(slot)
+        
+        threshold = max(1, count // FREQUENT_FRACTION)
+        self._token_masks = {token: self._rows_mask(self.tokens.get(token)) for token in self.tokens.keys
+                             if self.tokens.size(token) >= threshold}
+        self._word_cache = {}
+    
+    def __len__(self) -> int:
+        return len(self.prices)
+    
+    def product(self, row: int) -> Dict:
+        """سجل المنتج لرقم صف"""
+        columns = self.columns
+        return {
+            'code': columns['code'][row],
+            'name': columns['name'][row],
+            'image': columns['image'][row],
+            'price': self.prices[row],
+            'currency': columns['currency'][row],
+            'status': self.statuses[self.status_codes[row]],
+            'extracted_at': columns['extracted_at'][row]
+        }
+    
+    def count_by_status(self) -> Dict[str, int]:
+        """عدد المنتجات لكل حالة"""
+        return {status: _popcount(mask) for status, mask in self._status_masks.items()}
+    
+    def query(self, text: Optional[str] = None, status: Optional[str] = None, min_price: Optional[float] = None,
+              max_price: Optional[float] = None, sort: Optional[str] = None, page: int = 1,
+              per_page: int = 50) -> Dict:
+        """بحث وفلترة وترتيب وتقسيم صفحات، ويعيد المجموع وصفحة المنتجات المطلوبة"""
+        if sort not in SORTS:
+            raise ValueError(f"ترتيب غير مدعوم: {sort}")
+        page = max(1, page)
+        offset = (page - 1) * per_page
+        
+        mask = self._all
+        if status not in (None, 'all'):
+            mask = self._status_masks.get(STATUS_ALIASES.get(status, status), 0)
+        # نطاق السعر = نطاق صفوف متصل لأن الصفوف مرتبة بالسعر
+        lo = 0 if min_price is None else bisect_left(self.prices, min_price)
+        hi = len(self) if max_price is None else bisect_right(self.prices, max_price)
+        if lo > 0 or hi < len(self):
+            mask &= ((1 << hi) - 1) ^ ((1 << lo) - 1) if hi > lo else 0
+        for word in TOKEN_RE.findall(normalize_text(text or '')):
+            if not mask:
+                break
+            mask &= self._word_mask(word)
+        
+        total = _popcount(mask)
+        if sort in ('price', '-price'):
+            rows = self._mask_rows(mask, offset, per_page, reverse=sort == '-price')
+        elif total * 8 < len(self):
+            # نتائج قليلة: استخراجها ثم ترتيبها
+            rows = self._sorted(self._mask_rows(mask, 0, total), sort)[offset:offset + per_page]
+        else:
+            # نتائج كثيرة: المرور على الترتيب المحسوب مسبقاً حتى امتلاء الصفحة
+            rows = self._scan_order(mask, sort, offset, per_page)
+        
+        return {
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': (total + per_page - 1) // per_page,
+            'products': [self.product(row) for row in rows]
+        }
+    
+    def _word_mask(self, word: str) -> int:
+        """خريطة بت الصفوف التي يحتوي نصها على كلمة البحث
+        
+        كلمة البحث لا تحتوي فواصل، فهي جزء من نص الصف فقط إذا كانت جزءاً من إحدى كلماته،
+        لذلك تكفي مطابقتها مع مفردات الفهرس ثم جمع صفوف الكلمات المطابقة (نتيجة مطابقة تماماً)
+        """
+        mask = self._word_cache.get(word)
+        if mask is not None:
+            return mask
+        
+        mask = 0
+        keys = self.tokens.keys
+        for slot in self._candidate_tokens(word):
+            if word in keys[slot]:
+                mask |= self._postings_mask(self.tokens, keys[slot], self._token_masks)
+        
+        if len(self._word_cache) >= WORD_CACHE_SIZE:
+            self._word_cache.clear()
+        self._word_cache[word] = mask
+        return mask
+    
+    def _candidate_tokens(self, word: str) -> Iterable[int]:
+        """أرقام مفردات الفهرس التي تحتوي جميع مقاطع الكلمة (أو جميع المفردات للكلمات القصيرة)"""
+        if len(word) < NGRAM:
+            return range(len(self.tokens.keys))
+        candidates = None
+        for gram in sorted(set(_ngrams(word)), key=lambda gram: len(self._token_grams.get(gram, ()))):
+            slots = self._token_grams.get(gram)
+            if not slots:
+                return ()
+            candidates = set(slots) if candidates is None else candidates.intersection(slots)
+            if not candidates:
+                return ()
+        return candidates
+    
+    def _postings_mask(self, postings: _Postings, key: str, frequent: Dict[str, int]) -> int:
+        mask = frequent.get(key)
+        if mask is None:
+            rows = postings.get(key)
+            mask = self._rows_mask(rows) if rows else 0
+        return mask
+    
+    def _rows_mask(self, rows: Iterable[int]) -> int:
+        bits = bytearray((len(self) + 7) // 8)
+        for row in rows:
+            bits[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(bits, 'little')
+    
+    def _sorted(self, rows: List[int], sort: Optional[str]) -> List[int]:
+        if sort == 'price':
+            return sorted(rows)
+        if sort == '-price':
+            return sorted(rows, reverse=True)
+        if sort in ('name', '-name'):
+            return sorted(rows, key=self.name_rank.__getitem__, reverse=sort == '-name')
+        return sorted(rows, key=self.source_order.__getitem__)
+    
+    def _mask_rows(self, mask: int, skip: int, limit: int, reverse: bool = False) -> List[int]:
+        """أرقام الصفوف المفعلة في خريطة البت مع تخطي أول skip صف"""
+        data = mask.to_bytes((len(self) + 7) // 8, 'little')
+        rows = []
+        # كتل كبيرة لتخطي الصفوف بسرعة ثم كلمات 64 بت لاستخراجها
+        for block in _spans(len(data), 512, reverse):
+            value = int.from_bytes(data[block:block + 512], 'little')
+            if not value:
+                continue
+            count = _popcount(value)
+            if count <= skip:
+                skip -= count
+                continue
+            
+            for start in _spans(min(512, len(data) - block), 8, reverse):
+                word = int.from_bytes(data[block + start:block + start + 8], 'little')
+                if not word:
+                    continue
+                count = _popcount(word)
+                if count <= skip:
+                    skip -= count
+                    continue
+                
+                bits = []
+                base = (block + start) * 8
+                while word:
+                    low = word & -word
+                    bits.append(base + low.bit_length() - 1)
+                    word ^= low
+                if reverse:
+                    bits.reverse()
+                rows.extend(bits[skip:skip + limit - len(rows)])
+                skip = 0
+                if len(rows) >= limit:
+                    return rows
+        return rows
+    
+    def _scan_order(self, mask: int, sort: Optional[str], skip: int, limit: int) -> List[int]:
+        """المرور على ترتيب محسوب مسبقاً (الأصلي أو الاسم) واختيار الصفوف المفعلة"""
+        order = self._source_rows if sort is None else self.name_order
+        if sort == '-name':
+            order = reversed(order)
+        data = mask.to_bytes((len(self) + 7) // 8, 'little')
+        rows = []
+        for row in order:
+            if data[row >> 3] >> (row & 7) & 1:
+                if skip:
+                    skip -= 1
+                    continue
+                rows.append(row)
+                if len(rows) >= limit:
+                    break
+        return rows
+    
+    def save(self, path: str):
+        """حفظ الفهرس في ملف ثنائي"""
+        with open(path, 'wb') as f:
+            f.write(MAGIC + struct.pack('<HI', FORMAT_VERSION, len(self)))
+            for name in STRING_COLUMNS:
+                _write_strings(f, self.columns[name])
+            _write_strings(f, self.statuses)
+            _write_array(f, self.prices)
+            _write_bytes(f, self.status_codes)
+            _write_array(f, self.source_order)
+            _write_array(f, self.name_order)
+            _write_strings(f, self.tokens.keys)
+            _write_array(f, self.tokens.offsets)
+            _write_array(f, self.tokens.rows)
+    
+    @classmethod
+    def load(cls, path: str) -> 'CatalogIndex':
+        """تحميل فهرس محفوظ دون إعادة بنائه"""
+        with open(path, 'rb') as f:
+            header = f.read(len(MAGIC) + 6)
+            if header[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"ليس ملف فهرس كتالوج: {path}")
+            version, _ = struct.unpack('<HI', header[len(MAGIC):])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"إصدار فهرس غير مدعوم: {version}")
+            
+            index = cls.__new__(cls)
+            index.columns = {name: _read_strings(f) for name in STRING_COLUMNS}
+            index.statuses = _read_strings(f)
+            index.prices = _read_array(f, 'd')
+            index.status_codes = _read_bytes(f)
+            index.source_order = _read_array(f, 'I')
+            index.name_order = _read_array(f, 'I')
+            index.tokens = _Postings(_read_strings(f), _read_array(f, 'I'), _read_array(f, 'I'))
+        index._finish()
+        return index
+
+# تنسيق الملف: كل كتلة مسبوقة بطولها (little-endian)
+
+def _write_bytes(f, data: bytes):
+    f.write(struct.pack('<Q', len(data)))
+    f.write(data)
+
+def _read_bytes(f) -> bytes:
+    (size,) = struct.unpack('<Q', f.read(8))
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("ملف الفهرس مقطوع")
+    return data
+
+def _write_array(f, values: array):
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    _write_bytes(f, values.tobytes())
+
+def _read_array(f, typecode: str) -> array:
+    values = array(typecode)
+    values.frombytes(_read_bytes(f))
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+def _write_strings(f, strings: List[str]):
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = array('I', [0])
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    _write_array(f, offsets)
+    _write_bytes(f, b''.join(encoded))
+
+def _read_strings(f) -> List[str]:
+    offsets = _read_array(f, 'I')
+    blob = _read_bytes(f)
+    return [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+واجهة سطر أوامر غير تفاعلية لتشغيل مهام استخراج متعددة في عملية واحدة
+مناسبة لـ cron والحاويات: ملف مهام، رموز خروج واضحة، وملخص JSON للتشغيل
+
+الاستخدام:
+    python -m cli https://souqgomlaa.almatjar.store/ar/shop --crawl --format ndjson
+    python -m cli --job jobs.json --concurrency 4 --summary run.json
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from extractor import WholesaleProductExtractor
+from http_cache import HTTPCache
+from metrics import JSONLogExporter, Metrics, PrometheusExporter
+from selector_profile import SelectorProfileStore
+
+EXIT_OK = 0
+EXIT_JOB_FAILED = 1
+EXIT_USAGE = 2
+
+BACKENDS = ('requests', 'selenium', 'async', 'pipeline')
+# الطرق التي تدعم الزحف على صفحات الترقيم والأقسام
+CRAWL_BACKENDS = ('requests', 'pipeline')
+FORMATS = ('csv', 'json', 'ndjson', 'parquet')
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='cli',
+        description='مستخرج منتجات سوق الجملة - تشغيل غير تفاعلي'
+    )
+    parser.add_argument('urls', nargs='*', help='روابط المتاجر')
+    parser.add_argument('--job', help='ملف مهام JSON (أو ملف نصي برابط في كل سطر)')
+    parser.add_argument('--backend', choices=BACKENDS, default='requests', help='طريقة الاستخراج')
+    parser.add_argument('--crawl', action='store_true', help='زحف جميع صفحات الترقيم والأقسام (requests أو pipeline)')
+    parser.add_argument('--max-pages', type=int, default=200, help='الحد الأقصى للصفحات في وضع الزحف')
+    parser.add_argument('--concurrency', type=int, default=4, help='عدد المهام أو الصفحات المتوازية')
+    parser.add_argument('--format', choices=FORMATS, default='json', help='صيغة ملف النتائج')
+    parser.add_argument('--output-dir', default='.', help='مجلد ملفات النتائج')
+    parser.add_argument('--cache-dir', help='تفعيل ذاكرة HTTP المؤقتة في هذا المجلد')
+    parser.add_argument('--selector-profiles', help='ملف JSON لتعلم محددات كل موقع وتجربتها أولاً')
+    parser.add_argument('--store', help='حفظ النتائج في قاعدة SQLite مع سجل الأسعار')
+    parser.add_argument('--images', help='تحميل صور المنتجات إلى هذا المجلد')
+    parser.add_argument('--index', action='store_true', help='حفظ فهرس استعلام ثنائي (.idx) بجانب كل ملف نتائج')
+    parser.add_argument('--compact', action='store_true', help='استخدام سجلات Product المضغوطة')
+    parser.add_argument('--demo-fallback', action='store_true',
+                        help='إرجاع بيانات تجريبية عند الفشل (معطل افتراضياً في التشغيل الآلي)')
+    parser.add_argument('--summary', default='-', help='ملف ملخص التشغيل بصيغة JSON (- للمخرج القياسي)')
+    parser.add_argument('--quiet', action='store_true', help='إيقاف رسائل التقدم أثناء الاستخراج')
+    parser.add_argument('--metrics-file', help='كتابة المقاييس بصيغة Prometheus النصية')
+    parser.add_argument('--metrics-log', help='إضافة المقاييس كسطر JSON إلى ملف سجل')
+    return parser
+
+def load_jobs(path: str) -> List[Dict]:
+    """قراءة ملف المهام: {"defaults": {...}, "jobs": [...]} أو قائمة أو ملف نصي"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    
+    if not path.endswith('.json'):
+        return [{'url': line.strip()} for line in text.splitlines()
+                if line.strip() and not line.strip().startswith('#')]
+    
+    data = json.loads(text)
+    defaults = {}
+    if isinstance(data, dict):
+        defaults = data.get('defaults', {})
+        data = data.get('jobs', [])
+    
+    jobs = []
+    for item in data:
+        job = {'url': item} if isinstance(item, str) else dict(item)
+        if not job.get('url'):
+            raise ValueError(f"مهمة بدون رابط: {item}")
+        jobs.append({**defaults, **job})
+    return jobs
+
+def validate_jobs(jobs: List[Dict], args: argparse.Namespace):
+    """رفض المهام ذات الطريقة غير المعروفة أو التي تطلب الزحف بطريقة لا تدعمه"""
+    for job in jobs:
+        backend = job.get('backend', args.backend)
+        if backend not in BACKENDS:
+            raise ValueError(f"طريقة استخراج غير مدعومة في مهمة {job['url']}: {backend}")
+        if job.get('crawl', args.crawl) and backend not in CRAWL_BACKENDS:
+            raise ValueError(f"الزحف غير مدعوم مع طريقة {backend} (مهمة {job['url']})، "
+                             f"استخدم {' أو '.join(CRAWL_BACKENDS)}")
+    outputs = Counter(job['output'] for job in jobs if job.get('output'))
+    duplicates = sorted(output for output, count in outputs.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"ملف إخراج مشترك بين عدة مهام: {', '.join(duplicates)}")
+
+def _output_path(job: Dict, output_dir: str, timestamp: str) -> str:
+    if job.get('output'):
+        return job['output']
+    name = job.get('name') or re.sub(r'[^\w-]+', '_', urlparse(job['url']).netloc) or 'products'
+    return os.path.join(output_dir, f"{name}_{timestamp}.{job['format']}")
+
+def _output_paths(jobs: List[Dict], output_dir: str, timestamp: str) -> List[str]:
+    """مسار إخراج لكل مهمة، مع رقم المهمة عندما تتشارك عدة مهام نفس الاسم (مثل فئتين من نفس المتجر)"""
+    paths = [_output_path(job, output_dir, timestamp) for job in jobs]
+    counts = Counter(paths)
+    for i, (job, path) in enumerate(zip(jobs, paths)):
+        if counts[path] > 1 and not job.get('output'):
+            stem, extension = os.path.splitext(path)
+            paths[i] = f"{stem}_{i + 1}{extension}"
+    return paths
+
+class JobRunner:
+    """تشغيل قائمة مهام بمستخرج واحد دافئ وجمع ملخص كل مهمة"""
+    
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        cache = HTTPCache(args.cache_dir) if args.cache_dir else None
+        exporters = []
+        if args.metrics_file:
+            exporters.append(PrometheusExporter(args.metrics_file))
+        if args.metrics_log:
+            exporters.append(JSONLogExporter(args.metrics_log))
+        self.extractor = WholesaleProductExtractor(
+            cache=cache,
+            browser_pool_size=args.concurrency if args.backend == 'selenium' else 1,
+            compact_records=args.compact,
+            demo_fallback=args.demo_fallback,
+            metrics=Metrics(exporters),
+            quiet=args.quiet,
+            selector_profiles=SelectorProfileStore(args.selector_profiles) if args.selector_profiles else None
+        )
+    
+    def run(self, jobs: List[Dict]) -> List[Dict]:
+        jobs = [{**job, 'format': job.get('format', self.args.format)} for job in jobs]
+        jobs = [{**job, 'output': path}
+                for job, path in zip(jobs, _output_paths(jobs, self.args.output_dir, self.timestamp))]
+        results = [None] * len(jobs)
+        # مهام async تعمل معاً في حلقة أحداث واحدة وبقية المهام في مجمع الخيوط
+        async_jobs = [i for i, job in enumerate(jobs) if job.get('backend', self.args.backend) == 'async']
+        if async_jobs:
+            fetched = asyncio.run(self._fetch_async([jobs[i]['url'] for i in async_jobs]))
+            for i in async_jobs:
+                results[i] = self._finish(jobs[i], *fetched[jobs[i]['url']])
+        
+        other_jobs = [i for i in range(len(jobs)) if results[i] is None]
+        if other_jobs:
+            with ThreadPoolExecutor(max_workers=max(1, self.args.concurrency)) as pool:
+                for i, result in zip(other_jobs, pool.map(self._run_job, [jobs[i] for i in other_jobs])):
+                    results[i] = result
+        return results
+    
+    def _run_job(self, job: Dict) -> Dict:
+        start_time = time.time()
+        try:
+            products = self._extract(job)
+            error = None
+        except Exception as e:
+            products, error = [], e
+        return self._finish(job, products, error, time.time() - start_time)
+    
+    def _extract(self, job: Dict) -> List:
+        backend = job.get('backend', self.args.backend)
+        crawl = job.get('crawl', self.args.crawl)
+        max_pages = job.get('max_pages', self.args.max_pages)
+        
+        if backend == 'pipeline':
+            from pipeline import ParsePipeline
+            pipeline = ParsePipeline(self.extractor, fetch_workers=self.args.concurrency)
+            return pipeline.run([job['url']], follow_links=crawl, max_pages=max_pages)
+        if crawl and backend == 'requests':
+            return self.extractor.crawl(job['url'], max_pages=max_pages, max_workers=self.args.concurrency)
+        if backend == 'selenium':
+            return self.extractor._extract_with_selenium(job['url'])
+        return self.extractor._extract_with_requests(job['url'])
+    
+    async def _fetch_async(self, urls: List[str]) -> Dict[str, tuple]:
+        from async_extractor import AsyncWholesaleProductExtractor
+        
+        async with AsyncWholesaleProductExtractor(max_connections_per_host=self.args.concurrency,
+                                                  cache=self.extractor.cache,
+                                                  compact_records=self.args.compact,
+                                                  demo_fallback=self.args.demo_fallback,
+                                                  metrics=self.extractor.metrics,
+                                                  selector_profiles=self.extractor.selector_profiles,
+                                                  quiet=self.args.quiet) as extractor:
+
+            async def fetch(url):
+                start_time = time.time()
+                try:
+                    return url, (await extractor.aextract_from_souq_gomla(url), None, time.time() - start_time)
+                except Exception as e:
+                    return url, ([], e, time.time() - start_time)
+            
+            return dict(await asyncio.gather(*(fetch(url) for url in urls)))
+    
+    def _finish(self, job: Dict, products: List, error: Optional[Exception], elapsed: float) -> Dict:
+        """حفظ نتائج المهمة وبناء ملخصها"""
+        result = {
+            'url': job['url'],
+            'name': job.get('name'),
+            'status': 'error' if error else ('ok' if products else 'empty'),
+            'products': len(products),
+            'elapsed': round(elapsed, 3),
+            'output': None,
+            'error': str(error) if error else None
+        }
+        if not products:
+            return result
+        
+        try:
+            if self.args.images:
+                from image_pipeline import ImagePipeline
+                products = ImagePipeline(self.args.images, log=self.extractor._log).process(products)
+            
+            path = job['output']
+            summary = self.extractor.save_to_file(products, path, job['format'])
+            result.update(summary, output=path)
+            
+            if self.args.index:
+                from catalog_index import CatalogIndex
+                result['index'] = f"{path}.idx"
+                CatalogIndex(products).save(result['index'])
+            
+            if self.args.store:
+                from product_store import ProductStore
+                with ProductStore(self.args.store, log=self.extractor._log) as store:
+                    result['run_id'] = store.save_products(products, job['url'])
+        except Exception as e:
+            result.update(status='error', error=str(e))
+        return result
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """نقطة الدخول: تعيد رمز الخروج"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    try:
+        jobs = [{'url': url} for url in args.urls]
+        if args.job:
+            jobs += load_jobs(args.job)
+        validate_jobs(jobs, args)
+    except (OSError, ValueError) as e:
+        print(f"خطأ في المهام: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    
+    if not jobs:
+        parser.print_usage(sys.stderr)
+        print("يجب تحديد رابط واحد على الأقل أو ملف مهام", file=sys.stderr)
+        return EXIT_USAGE
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    started_at = datetime.now().isoformat()
+    start_time = time.time()
+    
+    # رسائل الاستخراج إلى stderr حتى يبقى الملخص على stdout قابلاً للقراءة آلياً
+    log_stream = sys.stderr if args.summary == '-' else sys.stdout
+    with contextlib.redirect_stdout(log_stream):
+        runner = JobRunner(args)
+        try:
+            results = runner.run(jobs)
+        finally:
+            runner.extractor.close()
+            runner.extractor.metrics.export()
+    
+    failed = [r for r in results if r['status'] != 'ok']
+    summary = {
+        'started_at': started_at,
+        'elapsed': round(time.time() - start_time, 3),
+        'backend': args.backend,
+        'jobs': results,
+        'succeeded': len(results) - len(failed),
+        'failed': len(failed),
+        'total_products': sum(r['products'] for r in results)
+    }
+    
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    if args.summary == '-':
+        print(text)
+    else:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            f.write(text)
+    
+    return EXIT_JOB_FAILED if failed else EXIT_OK
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تحميل المكتبات الاختيارية عند أول استخدام
+يسمح باستيراد المستخرج بسرعة دون تحميل requests و BeautifulSoup و Selenium إلا عند الحاجة
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import importlib
+import importlib.util
+from typing import Optional
+
+class MissingDependencyError(ImportError):
+    """مكتبة مطلوبة لهذه الميزة غير مثبتة"""
+    
+    def __init__(self, module: str, package: str):
+        super().__init__(f"يجب تثبيت {package}: pip install {package}", name=module)
+        self.package = package
+
+def is_available(module: str) -> bool:
+    """التحقق من وجود مكتبة دون استيرادها"""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+def require(module: str, package: Optional[str] = None):
+    """استيراد مكتبة أو رفع MissingDependencyError برسالة تثبيت واضحة"""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise MissingDependencyError(module, package or module) from e
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+كتّاب متدفقون لتصدير المنتجات (CSV و JSON و JSON Lines و Parquet)
+يكتب كل منتج فور استخراجه ويحسب الإحصائيات في مرور واحد بذاكرة محدودة
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from dependencies import is_available, require
+from models import PRODUCT_FIELDS, as_dict
+
+# pyarrow يُستورد عند إنشاء أول ملف Parquet فقط
+PYARROW_AVAILABLE = is_available('pyarrow')
+
+# أعمدة CSV بالعربية مع الحقل المقابل في سجل المنتج
+CSV_COLUMNS = [
+    ('كود المنتج', 'code'),
+    ('اسم المنتج', 'name'),
+    ('السعر', 'price'),
+    ('العملة', 'currency'),
+    ('الحالة', 'status'),
+    ('رابط الصورة', 'image'),
+    ('تاريخ الاستخراج', 'extracted_at')
+]
+
+class ProductSink:
+    """أساس الكتّاب المتدفقين: يكتب المنتجات واحداً تلو الآخر ويحسب الإحصائيات"""
+    
+    def __init__(self, filename: str, flush_every: int = 1000):
+        self.filename = filename
+        self.flush_every = flush_every
+        self.total_count = 0
+        self.available_count = 0
+        self.unavailable_count = 0
+        self._closed = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def write(self, product: Dict):
+        """كتابة منتج واحد"""
+        self._write_product(product)
+        self.total_count += 1
+        if product['status'] == 'متوفر':
+            self.available_count += 1
+        elif product['status'] == 'غير متوفر':
+            self.unavailable_count += 1
+        if self.total_count % self.flush_every == 0:
+            self._flush()
+    
+    def write_all(self, products: Iterable[Dict]) -> Dict:
+        """كتابة جميع المنتجات من قائمة أو مولد"""
+        for product in products:
+            self.write(product)
+        return self.summary()
+    
+    def summary(self) -> Dict:
+        """ملخص الإحصائيات المحسوبة أثناء الكتابة"""
+        return {
+            'total_count': self.total_count,
+            'available_count': self.available_count,
+            'unavailable_count': self.unavailable_count
+        }
+    
+    def close(self):
+        """إنهاء الملف وإغلاقه"""
+        if not self._closed:
+            self._closed = True
+            self._finish()
+    
+    def _write_product(self, product: Dict):
+        raise NotImplementedError
+    
+    def _flush(self):
+        pass
+    
+    def _finish(self):
+        pass
+
+class CSVSink(ProductSink):
+    """كاتب CSV متوافق مع Excel"""
+    
+    def __init__(self, filename: str, flush_every: int = 1000):
+        super().__init__(filename, flush_every)
+        self._file = open(filename, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([header for header, _ in CSV_COLUMNS])
+    
+    def _write_product(self, product: Dict):
+        self._writer.writerow([product[field] for _, field in CSV_COLUMNS])
+    
+    def _flush(self):
+        self._file.flush()
+    
+    def _finish(self):
+        self._file.close()
+
+class NDJSONSink(ProductSink):
+    """كاتب JSON Lines: منتج واحد في كل سطر"""
+    
+    def __init__(self, filename: str, flush_every: int = 1000):
+        super().__init__(filename, flush_every)
+        self._file = open(filename, 'w', encoding='utf-8')
+    
+    def _write_product(self, product: Dict):
+        self._file.write(json.dumps(as_dict(product), ensure_ascii=False))
+        self._file.write('\n')
+    
+    def _flush(self):
+        self._file.flush()
+    
+    def _finish(self):
+        self._file.close()
+
+class JSONSink(ProductSink):
+    """كاتب JSON متدفق بنفس بنية ملف save_to_json"""
+    
+    def __init__(self, filename: str, flush_every: int = 1000):
+        super().__init__(filename, flush_every)
+        self._file = open(filename, 'w', encoding='utf-8')
+        self._file.write('{\n  "products": [')
+    
+    def _write_product(self, product: Dict):
+        item = json.dumps(as_dict(product), ensure_ascii=False, indent=2).replace('\n', '\n    ')
+        self._file.write(('\n    ' if self.total_count == 0 else ',\n    ') + item)
+    
+    def _flush(self):
+        self._file.flush()
+    
+    def _finish(self):
+        self._file.write('\n  ]' if self.total_count else ']')
+        tail = json.dumps({
+            'total_count': self.total_count,
+            'extracted_at': datetime.now().isoformat(),
+            'available_count': self.available_count,
+            'unavailable_count': self.unavailable_count
+        }, ensure_ascii=False, indent=2)
+        self._file.write(',' + tail[1:])
+        self._file.close()
+
+class ParquetSink(ProductSink):
+    """كاتب Parquet بضغط الأعمدة، يكتب مجموعة صفوف كل batch_size منتج"""
+    
+    def __init__(self, filename: str, flush_every: int = 10000, compression: str = 'zstd'):
+        pa = self._pa = require('pyarrow')
+        pq = require('pyarrow.parquet', 'pyarrow')
+        
+        super().__init__(filename, flush_every)
+        self._schema = pa.schema([
+            ('code', pa.string()),
+            ('name', pa.string()),
+            ('image', pa.string()),
+            ('price', pa.float64()),
+            ('currency', pa.string()),
+            ('status', pa.string()),
+            ('extracted_at', pa.string())
+        ])
+        self._writer = pq.ParquetWriter(filename, self._schema, compression=compression)
+        self._columns = {field: [] for field in PRODUCT_FIELDS}
+    
+    def _write_product(self, product: Dict):
+        for field, column in self._columns.items():
+            column.append(product[field])
+    
+    def _flush(self):
+        if self._columns['code']:
+            self._writer.write_table(self._pa.table(self._columns, schema=self._schema))
+            self._columns = {field: [] for field in PRODUCT_FIELDS}
+    
+    def _finish(self):
+        self._flush()
+        self._writer.close()
+
+SINKS = {
+    'csv': CSVSink,
+    'json': JSONSink,
+    'ndjson': NDJSONSink,
+    'jsonl': NDJSONSink,
+    'parquet': ParquetSink
+}
+
+def open_sink(filename: str, fmt: Optional[str] = None, **kwargs) -> ProductSink:
+    """فتح كاتب مناسب حسب الصيغة أو امتداد الملف"""
+    fmt = (fmt or os.path.splitext(filename)[1].lstrip('.')).lower()
+    if fmt not in SINKS:
+        raise ValueError(f"صيغة تصدير غير مدعومة: {fmt}")
+    return SINKS[fmt](filename, **kwargs)
@@ -8,247 +8,804 @@
 الإصدار: 1.0.0
 """
 
-import requests
-import json
-import csv
 import time
-import re
 import os
+import sys
+import threading
+from collections import deque
 from datetime import datetime
-from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Optional
+from functools import lru_cache
+from types import SimpleNamespace
+from urllib.parse import urljoin, urlparse, urldefrag
+from typing import TYPE_CHECKING, List, Dict, Optional, Iterable, Iterator, Tuple
 
-try:
+from browser_pool import BrowserPool
+from dependencies import MissingDependencyError, is_available, require
+from exporters import open_sink
+from http_cache import HTTPCache
+from identity import DedupIndex, stable_product_code, unique_product_links
+from metrics import Metrics
+from selector_profile import SelectorProfile, SelectorProfileStore
+from models import Currency, Product, ProductStatus, as_dict
+from normalization import CURRENCY_PRICE_RE, CURRENCY_RE, classify_stock, parse_price, parse_prices
+from site_adapters import get_adapter, supported_sites
+from throttle import HostThrottle
+
+if TYPE_CHECKING:
     from bs4 import BeautifulSoup
-except ImportError:
-    print("يجب تثبيت BeautifulSoup: pip install beautifulsoup4")
-    exit(1)
 
-try:
-    from selenium import webdriver
+# المكتبات الثقيلة تُحمّل عند أول استخدام فقط لتسريع بدء التشغيل
+SELENIUM_AVAILABLE = is_available('selenium')
+LXML_AVAILABLE = is_available('lxml')
+
+@lru_cache(maxsize=None)
+def _beautiful_soup():
+    """تحميل BeautifulSoup عند أول تحليل"""
+    return require('bs4', 'beautifulsoup4').BeautifulSoup
+
+@lru_cache(maxsize=None)
+def _selenium() -> SimpleNamespace:
+    """تحميل وحدات Selenium عند أول استخدام"""
+    require('selenium')
+    from selenium.common.exceptions import TimeoutException
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
-    from selenium.webdriver.chrome.options import Options
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    print("تحذير: Selenium غير مثبت. سيتم استخدام requests فقط.")
-    print("لتثبيت Selenium: pip install selenium")
-    SELENIUM_AVAILABLE = False
+    return SimpleNamespace(TimeoutException=TimeoutException, By=By, WebDriverWait=WebDriverWait, EC=EC)
+
+# محلل HTML الافتراضي: lxml أسرع بكثير عند توفره
+DEFAULT_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+# محددات عناصر المنتج وحقوله بترتيب الأولوية
+PRODUCT_SELECTORS = ['.product-item', '.product', '.item', '.product-card', '.card']
+NAME_SELECTORS = ['.product-title', '.product-name', 'h1', 'h2', 'h3', 'h4', '.title', '.name']
+PRICE_SELECTORS = ['.price', '.product-price', '.cost']
+FALLBACK_CONTAINERS = {'div', 'article', 'section', 'li'}
+PLACEHOLDER_IMAGE = 'https://via.placeholder.com/200x200/f0f0f0/999?text=لا+توجد+صورة'
+
+# عناصر لا تحتوي نصاً مرئياً عند البحث الاحتياطي عن الأسعار
+NON_TEXT_TAGS = {'script', 'style', 'noscript', 'template'}
+
+class ExtractionPlan:
+    """خطة استخراج مُجمّعة تجمع حقول المنتج في مرور واحد على عناصره"""
+    
+    def __init__(self, name_selectors: List[str] = NAME_SELECTORS, price_selectors: List[str] = PRICE_SELECTORS):
+        self.name_selectors = list(name_selectors)
+        self.price_selectors = list(price_selectors)
+        self._name_tags, self._name_classes = self._compile(self.name_selectors)
+        self._price_tags, self._price_classes = self._compile(self.price_selectors)
+    
+    @staticmethod
+    def _compile(selectors: List[str]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """تحويل المحددات البسيطة (وسم أو .صنف) إلى جداول بحث حسب الأولوية"""
+        tags, classes = {}, {}
+        for rank, selector in enumerate(selectors):
+            if selector.startswith('.') and selector[1:].replace('-', '').replace('_', '').isalnum():
+                classes.setdefault(selector[1:], rank)
+            elif selector.isalnum():
+                tags.setdefault(selector.lower(), rank)
+            else:
+                raise ValueError(f"محدد غير مدعوم في خطة الاستخراج: {selector}")
+        return tags, classes
+    
+    def collect(self, element) -> Tuple[List, List, Optional[object], Optional[str], Optional[str]]:
+        """جمع أول تطابق لكل محدد اسم وسعر وأول صورة وكود المنتج ورابطه في مرور واحد"""
+        name_nodes = [None] * len(self.name_selectors)
+        price_nodes = [None] * len(self.price_selectors)
+        name_tags, name_classes = self._name_tags, self._name_classes
+        price_tags, price_classes = self._price_tags, self._price_classes
+        img = None
+        code = element.get('data-product-id') or None
+        link = element.get('href') if element.name == 'a' else None
+        
+        for node in element.descendants:
+            tag = node.name
+            if tag is None:
+                continue
+            
+            rank = name_tags.get(tag)
+            if rank is not None and name_nodes[rank] is None:
+                name_nodes[rank] = node
+            rank = price_tags.get(tag)
+            if rank is not None and price_nodes[rank] is None:
+                price_nodes[rank] = node
+            
+            attrs = node.attrs
+            for cls in attrs.get('class') or ():
+                rank = name_classes.get(cls)
+                if rank is not None and name_nodes[rank] is None:
+                    name_nodes[rank] = node
+                rank = price_classes.get(cls)
+                if rank is not None and price_nodes[rank] is None:
+                    price_nodes[rank] = node
+            
+            if img is None and tag == 'img':
+                img = node
+            if code is None and attrs.get('data-product-id'):
+                code = attrs['data-product-id']
+            if link is None and tag == 'a' and attrs.get('href'):
+                link = attrs['href']
+        
+        return name_nodes, price_nodes, img, code, link
+
+# سكريبت يجمع حقول جميع بطاقات المنتجات في المتصفح ويعيدها كبيانات JSON
+HARVEST_SCRIPT = """
+const [productSelectors, nameSelectors, priceSelectors] = arguments;
+let cards = [], matched = null;
+for (const selector of productSelectors) {
+    const found = document.querySelectorAll(selector);
+    if (found.length) { cards = found; matched = selector; break; }
+}
+const items = Array.from(cards, card => {
+    let name = null;
+    for (const selector of nameSelectors) {
+        const el = card.querySelector(selector);
+        if (el && el.innerText.trim()) { name = el.innerText.trim(); break; }
+    }
+    const prices = [];
+    for (const selector of priceSelectors) {
+        const el = card.querySelector(selector);
+        if (el) prices.push(el.innerText);
+    }
+    const img = card.querySelector('img');
+    const coded = card.querySelector('[data-product-id]');
+    const link = card.matches('a[href]') ? card : card.querySelector('a[href]');
+    return {
+        name: name,
+        prices: prices,
+        image: img ? (img.getAttribute('data-src') || img.getAttribute('src')) : null,
+        code: card.getAttribute('data-product-id') || (coded && coded.getAttribute('data-product-id')),
+        link: link ? link.getAttribute('href') : null,
+        text: card.innerText
+    };
+});
+return {selector: matched, items: items};
+"""
+
+# ترويسات HTTP المشتركة بين requests و aiohttp
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'ar,en-US;q=0.7,en;q=0.3',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# روابط الترقيم والأقسام التي يتبعها وضع الزحف
+PAGINATION_SELECTORS = ['a[rel="next"]', '.pagination a', '.pager a', 'a.page-link', 'a[href*="page="]', 'a[href*="/page/"]']
+CATEGORY_SELECTORS = ['a[href*="/category"]', 'a[href*="/categories"]', 'a[href*="/collections/"]', 'a[href*="/shop/"]']
 
 class WholesaleProductExtractor:
     """مستخرج منتجات سوق الجملة"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'ar,en-US;q=0.7,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+    def __init__(self, cache: Optional[HTTPCache] = None, parser: Optional[str] = None,
+                 browser_pool_size: int = 1, recycle_after: int = 50, wait_timeout: float = 15,
+                 selenium_mode: str = 'batch', compact_records: bool = False, use_adapters: bool = True,
+                 throttle: Optional[HostThrottle] = None, rate_limit: bool = True, demo_fallback: bool = True,
+                 metrics: Optional[Metrics] = None, quiet: bool = False,
+                 selector_profiles: Optional[SelectorProfileStore] = None):
+        self.cache = cache
+        # ترتيب المحددات المتعلم لكل نطاق وخطط الاستخراج المبنية منه
+        self.selector_profiles = selector_profiles
+        self._profile_plans = {}
+        # مؤقتات المراحل وعدادات الصفحات والمنتجات والمحددات
+        self.metrics = metrics or Metrics()
+        # الوضع الهادئ يلغي رسائل التقدم والرسائل الخاصة بكل منتج
+        self.quiet = quiet
+        self.use_adapters = use_adapters
+        # تحديد المعدل وإعادة المحاولة لكل نطاق
+        self.throttle = throttle or (HostThrottle(log=self._log) if rate_limit else None)
+        # في التشغيل الفعلي يفضل تعطيل البيانات التجريبية ليظهر الخطأ بدلاً من بيانات مزيفة
+        self.demo_fallback = demo_fallback
+        self.parser = parser or DEFAULT_PARSER
+        self.plan = ExtractionPlan()
+        self.browser_pool_size = browser_pool_size
+        self.recycle_after = recycle_after
+        self.wait_timeout = wait_timeout
+        # batch: استدعاء JavaScript واحد لكل صفحة، elements: طلب WebDriver لكل حقل
+        self.selenium_mode = selenium_mode
+        self._browser_pool = None
+        self._browser_pool_lock = threading.Lock()
+        # جلسة requests تُنشأ عند أول طلب
+        self._session = None
+        self._session_lock = threading.Lock()
         self.products = []
+        # سجلات Product مضغوطة بدلاً من القواميس مع طابع زمني واحد للتشغيل
+        self.compact_records = compact_records
+        self.run_timestamp = time.time()
         
-    def extract_from_souq_gomla(self, url: str, use_selenium: bool = False) -> List[Dict]:
+    @property
+    def session(self):
+        """جلسة requests المشتركة (تحميل المكتبة عند أول استخدام)"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = require('requests').Session()
+                    session.headers.update(DEFAULT_HEADERS)
+                    self._session = session
+        return self._session
+    
+    def _log(self, message: str):
+        """طباعة رسالة تقدم ما لم يكن الوضع الهادئ مفعلاً"""
+        if not self.quiet:
+            print(message)
+    
+    def extract_from_souq_gomla(self, url: str, use_selenium: bool = False, crawl: bool = False) -> List[Dict]:
         """استخراج منتجات من سوق الجملة"""
-        print(f"بدء استخراج منتجات سوق الجملة من: {url}")
+        self._log(f"بدء استخراج منتجات سوق الجملة من: {url}")
         
+        if crawl:
+            return self.crawl(url)
         if use_selenium and SELENIUM_AVAILABLE:
             return self._extract_with_selenium(url)
         else:
             return self._extract_with_requests(url)
     
+    def _fetch_content(self, url: str) -> Tuple[bytes, bool]:
+        """تحميل محتوى الصفحة مع طلب شرطي عند تفعيل الذاكرة المؤقتة، ويعيد (المحتوى، لم يتغير)"""
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+        with self.metrics.timer('fetch'):
+            response = self._get(url, headers)
+            
+            if response.status_code == 304 and self.cache:
+                body = self.cache.get_body(url)
+                if body is not None:
+                    self.cache.record_hit(url)
+                    self.metrics.inc('not_modified_pages')
+                    return body, True
+                # المحتوى المحفوظ مفقود، نعيد التحميل بدون شروط
+                response = self._get(url)
+        
+        self.metrics.inc('fetched_bytes', len(response.content))
+        response.raise_for_status()
+        if self.cache:
+            self.cache.record_miss(url)
+            self.cache.store(url, response.headers, response.content)
+        return response.content, False
+    
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """إرسال طلب GET عبر محدد المعدل إن وجد"""
+        if self.throttle:
+            return self.throttle.request(url, lambda: self.session.get(url, timeout=30, headers=headers))
+        return self.session.get(url, timeout=30, headers=headers)
+    
+    def _load_page(self, url: str, limit: Optional[int] = 20, discover_links: bool = False) -> Tuple[List[Dict], List[str]]:
+        """تحميل صفحة وتحليلها"""
+        content, not_modified = self._fetch_content(url)
+        return self._parse_page(url, content, not_modified, limit, discover_links)
+    
+    def _parse_page(self, url: str, content: bytes, not_modified: bool, limit: Optional[int],
+                    discover_links: bool) -> Tuple[List[Dict], List[str]]:
+        """تحليل صفحة مع تخطي التحليل إذا لم تتغير منذ آخر تشغيل"""
+        if not_modified:
+            payload = self.cache.get_payload(url)
+            if payload and payload['limit'] == limit and (payload['links'] is not None or not discover_links):
+                self._log("الصفحة لم تتغير، تم استخدام النتائج المحفوظة")
+                products = payload['products']
+                self.metrics.inc('cached_pages')
+                self.metrics.inc('products', len(products))
+                # المنتجات المعاد استخدامها تحمل وقت هذا التشغيل لا وقت أول تحليل
+                if self.compact_records:
+                    products = [Product.from_dict(p) for p in products]
+                    for product in products:
+                        product.extracted_at = self.run_timestamp
+                else:
+                    extracted_at = datetime.now().isoformat()
+                    for product in products:
+                        product['extracted_at'] = extracted_at
+                return products, payload['links'] or []
+        
+        soup = self._make_soup(content)
+        products = self._parse_products_from_soup(soup, url, limit)
+        links = self._discover_links(soup, url) if discover_links else None
+        if self.cache:
+            self.cache.store_payload(url, {'limit': limit, 'products': [as_dict(p) for p in products], 'links': links})
+        return products, links or []
+    
+    def _make_soup(self, content: bytes) -> 'BeautifulSoup':
+        """تحويل محتوى الصفحة إلى BeautifulSoup"""
+        BeautifulSoup = _beautiful_soup()
+        with self.metrics.timer('parse'):
+            return BeautifulSoup(content, self.parser)
+    
     def _extract_with_requests(self, url: str) -> List[Dict]:
         """استخراج باستخدام requests"""
         try:
-            print("جاري تحميل الصفحة...")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return self._parse_products_from_soup(soup, url)
+            self._log("جاري تحميل الصفحة...")
+            content, not_modified = self._fetch_content(url)
+            return self._extract_from_content(url, content, not_modified)
             
+        except MissingDependencyError:
+            raise
         except Exception as e:
-            print(f"خطأ في استخراج requests: {e}")
+            self._log(f"خطأ في استخراج requests: {e}")
+            self.metrics.inc('errors', backend='requests')
+            if not self.demo_fallback:
+                raise
             return self._get_demo_products()
+        finally:
+            if self.cache:
+                self.cache.flush()
+            if self.selector_profiles:
+                self.selector_profiles.flush()
+    
+    def _extract_from_content(self, url: str, content: bytes, not_modified: bool) -> List[Dict]:
+        """استخراج منتجات صفحة محملة: من بيانات JSON المضمنة إن وجد محول للموقع، وإلا بتحليل HTML"""
+        adapter = get_adapter(url) if self.use_adapters else None
+        if adapter:
+            products = adapter.extract(self, url, content)
+            if products:
+                self._log(f"تم استخراج {len(products)} منتج من بيانات JSON ({adapter.name})")
+                self.metrics.inc('adapter_pages', adapter=adapter.name)
+                self.metrics.inc('products', len(products))
+                return products
+            self._log("لم يتم العثور على بيانات JSON، سيتم تحليل HTML")
+        
+        products, _ = self._parse_page(url, content, not_modified, 20, False)
+        return products
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """إغلاق المتصفحات المفتوحة وحفظ ملفات المحددات والذاكرة المؤقتة"""
+        if self.cache:
+            self.cache.flush()
+        if self.selector_profiles:
+            self.selector_profiles.flush()
+        if self._browser_pool is not None:
+            self._browser_pool.close()
+            self._browser_pool = None
+    
+    def _get_browser_pool(self) -> BrowserPool:
+        """إنشاء مجمع المتصفحات عند أول استخدام"""
+        with self._browser_pool_lock:
+            if self._browser_pool is None:
+                self._browser_pool = BrowserPool(self.browser_pool_size, self.recycle_after, log=self._log)
+            return self._browser_pool
+    
+    def extract_many_with_selenium(self, urls: List[str]) -> Dict[str, List[Dict]]:
+        """استخراج عدة روابط بالتوازي باستخدام متصفحات المجمع"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=self.browser_pool_size) as pool:
+            results = pool.map(self._extract_with_selenium, urls)
+            return dict(zip(urls, results))
     
     def _extract_with_selenium(self, url: str) -> List[Dict]:
         """استخراج باستخدام Selenium"""
-        driver = None
         try:
-            print("جاري بدء Selenium...")
-            
-            # إعداد Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1366,768')
-            
-            driver = webdriver.Chrome(options=chrome_options)
-            
-            print("جاري تحميل الصفحة...")
+            with self._get_browser_pool().driver() as driver:
+                return self._extract_with_driver(driver, url)
+        except MissingDependencyError:
+            raise
+        except Exception as e:
+            self._log(f"خطأ في Selenium: {e}")
+            self.metrics.inc('errors', backend='selenium')
+            if not self.demo_fallback:
+                raise
+            return self._get_demo_products()
+    
+    def _extract_with_driver(self, driver, url: str) -> List[Dict]:
+        """استخراج المنتجات من صفحة باستخدام متصفح جاهز"""
+        selenium = _selenium()
+        By = selenium.By
+        self._log("جاري تحميل الصفحة...")
+        with self.metrics.timer('fetch'):
             driver.get(url)
             
-            # انتظار تحميل المحتوى
-            time.sleep(5)
-            
-            # البحث عن عناصر المنتجات
-            selectors = ['.product-item', '.product', '.item', '.product-card', '.card']
-            product_elements = []
-            
-            for selector in selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        product_elements = elements
-                        print(f"وجد {len(elements)} عنصر باستخدام {selector}")
-                        break
-                except:
-                    continue
-            
-            products = []
-            for i, element in enumerate(product_elements[:20]):  # اقتصار على 20 منتج
+            # انتظار ظهور عناصر المنتجات بدلاً من الانتظار الثابت
+            try:
+                selenium.WebDriverWait(driver, self.wait_timeout).until(
+                    selenium.EC.presence_of_element_located((By.CSS_SELECTOR, ', '.join(PRODUCT_SELECTORS)))
+                )
+            except selenium.TimeoutException:
+                self._log("انتهت مهلة انتظار ظهور المنتجات")
+                self.metrics.inc('wait_timeouts')
+        
+        if self.selenium_mode == 'batch':
+            with self.metrics.timer('extract'):
+                products = self._harvest_products_selenium(driver, url)
+            self.metrics.inc('pages')
+            self.metrics.inc('products', len(products))
+            return products
+        
+        # البحث عن عناصر المنتجات
+        product_elements = []
+        
+        for selector in PRODUCT_SELECTORS:
+            try:
+                elements = driver.find_elements(By.CSS_SELECTOR, selector)
+                if elements:
+                    product_elements = elements
+                    self._log(f"وجد {len(elements)} عنصر باستخدام {selector}")
+                    break
+            except:
+                continue
+        
+        products = []
+        with self.metrics.timer('extract'):
+            product_elements = product_elements[:20]  # اقتصار على 20 منتج
+            links = unique_product_links([self._selenium_link(element) for element in product_elements], url)
+            for i, (element, link) in enumerate(zip(product_elements, links)):
                 try:
-                    product = self._extract_product_from_element_selenium(element, i)
+                    product = self._extract_product_from_element_selenium(element, i, url, link)
                     if product:
                         products.append(product)
                 except Exception as e:
-                    print(f"خطأ في استخراج المنتج {i}: {e}")
+                    self.metrics.inc('product_errors')
+                    self._log(f"خطأ في استخراج المنتج {i}: {e}")
                     continue
-            
-            print(f"تم استخراج {len(products)} منتج باستخدام Selenium")
-            return products
-            
-        except Exception as e:
-            print(f"خطأ في Selenium: {e}")
-            return self._get_demo_products()
+        
+        self._log(f"تم استخراج {len(products)} منتج باستخدام Selenium")
+        self.metrics.inc('pages')
+        self.metrics.inc('products', len(products))
+        return products
+    
+    def crawl(self, start_url: str, max_pages: int = 200, max_workers: int = 8, per_host_limit: int = 4) -> List[Dict]:
+        """زحف كامل على صفحات الترقيم والأقسام وإرجاع الكتالوج بدون تكرار"""
+        stats = {}
+        products = list(self.iter_crawl(start_url, max_pages, max_workers, per_host_limit, stats))
+        self._log(f"تم زحف {stats['pages']} صفحة واستخراج {stats['products']} منتج في {stats['elapsed']:.2f} ثانية "
+                  f"({stats['pages_per_second']:.2f} صفحة/ث، {stats['products_per_second']:.2f} منتج/ث)")
+        return products
+    
+    def iter_crawl(self, start_url: str, max_pages: int = 200, max_workers: int = 8,
+                   per_host_limit: int = 4, stats: Optional[Dict] = None) -> Iterator[Dict]:
+        """زحف متوازي بعدد محدود من العمال مع إرجاع المنتجات فور استخراجها
+        
+        إحصائيات هذا الزحف فقط تُكتب في القاموس stats إذا مُرر (آمن مع عمليات زحف متزامنة)
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        
+        stats = stats if stats is not None else {}
+        stats.update({'pages': 0, 'failed_pages': 0, 'products': 0, 'duplicates': 0,
+                      'elapsed': 0.0, 'pages_per_second': 0.0, 'products_per_second': 0.0})
+        start_time = time.time()
+        
+        # حد أقصى للطلبات المتزامنة لكل نطاق
+        host_slots = {}
+        host_lock = threading.Lock()
+        
+        def host_slot(url):
+            host = urlparse(url).netloc
+            with host_lock:
+                if host not in host_slots:
+                    host_slots[host] = threading.BoundedSemaphore(per_host_limit)
+                return host_slots[host]
+        
+        def fetch_and_parse(url):
+            with host_slot(url):
+                content, not_modified = self._fetch_content(url)
+            return self._parse_page(url, content, not_modified, None, True)
+        
+        seen_urls = {urldefrag(start_url)[0]}
+        frontier = deque(seen_urls)
+        seen_products = DedupIndex()
+        pending = {}
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                while frontier or pending:
+                    while frontier and len(pending) < max_workers:
+                        url = frontier.popleft()
+                        pending[pool.submit(fetch_and_parse, url)] = url
+                    
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url = pending.pop(future)
+                        try:
+                            products, links = future.result()
+                        except Exception as e:
+                            stats['failed_pages'] += 1
+                            self.metrics.inc('failed_pages')
+                            self._log(f"خطأ في تحميل الصفحة {url}: {e}")
+                            continue
+                        
+                        stats['pages'] += 1
+                        for link in links:
+                            if link not in seen_urls and len(seen_urls) < max_pages:
+                                seen_urls.add(link)
+                                frontier.append(link)
+                        
+                        for product in products:
+                            if not seen_products.add(product['code']):
+                                stats['duplicates'] += 1
+                                continue
+                            stats['products'] += 1
+                            yield product
         finally:
-            if driver:
-                driver.quit()
+            elapsed = time.time() - start_time
+            stats['elapsed'] = elapsed
+            if elapsed > 0:
+                stats['pages_per_second'] = stats['pages'] / elapsed
+                stats['products_per_second'] = stats['products'] / elapsed
+            if self.cache:
+                self.cache.flush()
+                stats['cache'] = self.cache.stats()
+            if self.selector_profiles:
+                self.selector_profiles.flush()
     
-    def _parse_products_from_soup(self, soup: BeautifulSoup, base_url: str) -> List[Dict]:
+    def _discover_links(self, soup: 'BeautifulSoup', page_url: str) -> List[str]:
+        """اكتشاف روابط الترقيم والأقسام داخل نفس الموقع"""
+        host = urlparse(page_url).netloc
+        links = []
+        seen = set()
+        
+        for selector in PAGINATION_SELECTORS + CATEGORY_SELECTORS:
+            for anchor in soup.select(selector):
+                href = anchor.get('href')
+                if not href or href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+                    continue
+                
+                link = urldefrag(urljoin(page_url, href))[0]
+                parsed = urlparse(link)
+                if parsed.scheme not in ('http', 'https') or parsed.netloc != host:
+                    continue
+                if link not in seen:
+                    seen.add(link)
+                    links.append(link)
+        
+        return links
+    
+    def _parse_products_from_soup(self, soup: 'BeautifulSoup', base_url: str, limit: Optional[int] = 20) -> List[Dict]:
         """تحليل المنتجات من BeautifulSoup"""
-        products = []
+        profile = self.selector_profiles.get(base_url) if self.selector_profiles else None
+        learned = None
+        if profile:
+            learned = self.selector_profiles.learned(profile, PRODUCT_SELECTORS, NAME_SELECTORS, PRICE_SELECTORS)
+        products = self._parse_with_profile(soup, base_url, limit, profile, learned) if learned else None
         
-        # البحث عن عناصر المنتجات
-        selectors = ['.product-item', '.product', '.item', '.product-card', '.card']
-        product_elements = []
+        if products is None:
+            hits = ({}, {})
+            products, selector, _ = self._extract_products(soup, base_url, limit, PRODUCT_SELECTORS, self.plan, hits)
+            # صفحات البحث الاحتياطي عن الأسعار لا تعلم شيئاً عن المحددات
+            if profile and selector and products:
+                if learned and not self._matches_learned(learned, selector, hits):
+                    # فشلت المحددات المتعلمة ونجحت محددات أخرى: تغير تخطيط الموقع
+                    # (أما إذا اختار البحث الكامل نفس المحددات فالصفحة قليلة البيانات فقط، مثل منتجات نفذت)
+                    self._log("تغير تخطيط الموقع، سيتم إعادة تعلم المحددات")
+                    self.metrics.inc('profile_invalidations')
+                    self.selector_profiles.invalidate(profile)
+                self.selector_profiles.record_page(profile, selector, *hits)
+        
+        self._log(f"تم استخراج {len(products)} منتج باستخدام BeautifulSoup")
+        self.metrics.inc('pages')
+        self.metrics.inc('products', len(products))
+        return products
+    
+    @staticmethod
+    def _matches_learned(learned: Tuple[List[str], List[str], List[str]], selector: str,
+                         hits: Tuple[Dict[str, int], Dict[str, int]]) -> bool:
+        """هل اختار البحث الكامل نفس محددات المنتج والاسم والسعر المتعلمة؟"""
+        product_selectors, name_selectors, price_selectors = learned
+        return (selector == product_selectors[0] and set(hits[0]) <= set(name_selectors)
+                and set(hits[1]) <= set(price_selectors))
+    
+    def _parse_with_profile(self, soup: 'BeautifulSoup', base_url: str, limit: Optional[int], profile: SelectorProfile,
+                            learned: Tuple[List[str], List[str], List[str]]) -> Optional[List[Dict]]:
+        """تحليل بالمحددات المتعلمة للنطاق، ويعيد None إذا لم تعد تناسب الصفحة"""
+        product_selectors, name_selectors, price_selectors = learned
+        key = (tuple(name_selectors), tuple(price_selectors))
+        plan = self._profile_plans.get(key)
+        if plan is None:
+            plan = self._profile_plans[key] = ExtractionPlan(name_selectors, price_selectors)
+        
+        hits = ({}, {})
+        products, selector, candidates = self._extract_products(soup, base_url, limit, product_selectors, plan, hits)
+        
+        # تحقق سريع: المحدد المتعلم ما زال يطابق ومعظم العناصر أنتجت منتجات
+        if selector != product_selectors[0] or not products or len(products) * 2 < candidates:
+            return None
+        # ومعظم العناصر وجدت اسمها وسعرها بالمحددات المتعلمة (وإلا فقد تغيرت أسماء الفئات في الموقع)
+        if profile.name and sum(hits[0].values()) * 2 < candidates:
+            return None
+        if profile.price and sum(hits[1].values()) * 2 < candidates:
+            return None
         
+        self.metrics.inc('profile_pages')
+        self.selector_profiles.record_page(profile, selector, *hits)
+        return products
+    
+    def _extract_products(self, soup: 'BeautifulSoup', base_url: str, limit: Optional[int], selectors: List[str],
+                          plan: ExtractionPlan, hits: Tuple[Dict[str, int], Dict[str, int]]) -> Tuple[List[Dict], Optional[str], int]:
+        """استخراج المنتجات بقائمة محددات وخطة معينة، ويعيد (المنتجات، المحدد المطابق، عدد العناصر)"""
+        products = []
+        with self.metrics.timer('extract'):
+            product_elements, selector = self._find_product_elements(soup, limit, selectors)
+            product_elements = product_elements[:limit]
+            
+            rows = []
+            for i, element in enumerate(product_elements):
+                fields = self._extract_product_from_element_soup(element, i, plan, hits)
+                if fields:
+                    rows.append(fields)
+            products = self._build_products(rows, base_url, plan, hits)
+        
+        return products, selector, len(product_elements)
+    
+    def _find_product_elements(self, soup: 'BeautifulSoup', limit: Optional[int],
+                               selectors: List[str] = PRODUCT_SELECTORS) -> Tuple[List, Optional[str]]:
+        """البحث عن عناصر المنتجات في الصفحة، ويعيد (العناصر، المحدد المطابق أو None للبحث الاحتياطي)"""
         for selector in selectors:
+            self.metrics.inc('selector_probes', selector=selector)
             elements = soup.select(selector)
             if elements:
-                product_elements = elements
-                print(f"وجد {len(elements)} عنصر باستخدام {selector}")
-                break
-        
-        # إذا لم نجد عناصر محددة، نبحث عن عناصر تحتوي على أسعار
-        if not product_elements:
-            price_pattern = re.compile(r'\d+\s*جنيه')
-            all_elements = soup.find_all(['div', 'article', 'section', 'li'])
-            
-            for element in all_elements:
-                if element.get_text() and price_pattern.search(element.get_text()) and element.find('img'):
-                    product_elements.append(element)
-                    if len(product_elements) >= 20:
-                        break
-            
-            print(f"وجد {len(product_elements)} عنصر محتمل يحتوي على منتجات")
+                self.metrics.inc('selector_hits', selector=selector)
+                self._log(f"وجد {len(elements)} عنصر باستخدام {selector}")
+                return elements, selector
         
-        for i, element in enumerate(product_elements[:20]):
-            try:
-                product = self._extract_product_from_element_soup(element, i, base_url)
-                if product:
-                    products.append(product)
-            except Exception as e:
-                print(f"خطأ في استخراج المنتج {i}: {e}")
+        self.metrics.inc('fallback_pages')
+        # إذا لم نجد عناصر محددة، نبحث عن أقرب حاوية تضم صورة لكل نص يحتوي على عملة،
+        # ونقبلها إذا احتوى نصها الكامل على سعر (الرقم والعملة قد يكونان في عنصرين منفصلين)
+        candidates = []
+        checked = {}
+        for text_node in soup.find_all(string=CURRENCY_RE):
+            container = text_node.parent
+            if container is None or container.name in NON_TEXT_TAGS:
                 continue
+            while container is not None:
+                if container.name in FALLBACK_CONTAINERS and container.find('img'):
+                    if id(container) not in checked:
+                        has_price = bool(CURRENCY_PRICE_RE.search(text_node) or
+                                         CURRENCY_PRICE_RE.search(container.get_text(' ')))
+                        checked[id(container)] = has_price
+                        if has_price:
+                            candidates.append(container)
+                    break
+                container = container.parent
         
-        print(f"تم استخراج {len(products)} منتج باستخدام BeautifulSoup")
-        return products
+        # استبعاد الحاويات الخارجية التي تضم منتجات أخرى
+        enclosing = set()
+        for container in candidates:
+            for parent in container.parents:
+                enclosing.add(id(parent))
+        product_elements = [c for c in candidates if id(c) not in enclosing][:limit]
+        
+        self._log(f"وجد {len(product_elements)} عنصر محتمل يحتوي على منتجات")
+        return product_elements, None
     
-    def _extract_product_from_element_soup(self, element, index: int, base_url: str) -> Optional[Dict]:
-        """استخراج منتج من عنصر BeautifulSoup"""
+    def _extract_product_from_element_soup(self, element, index: int, plan: Optional[ExtractionPlan] = None,
+                                           hits: Optional[Tuple[Dict[str, int], Dict[str, int]]] = None) -> Optional[Tuple]:
+        """جمع الحقول الخام لمنتج من عنصر BeautifulSoup (مع تسجيل محددات الاسم الناجحة في hits)
+        
+        يعيد (الترتيب، الاسم، نصوص الأسعار المرشحة، الصورة، الكود، النص، الرابط) لتحويلها مع بقية الصفحة
+        """
+        plan = plan or self.plan
         try:
+            name_nodes, price_nodes, img_elem, code, link = plan.collect(element)
+            
             # استخراج الاسم
-            name_selectors = ['.product-title', '.product-name', 'h1', 'h2', 'h3', 'h4', '.title', '.name']
             name = None
-            for selector in name_selectors:
-                name_elem = element.select_one(selector)
-                if name_elem and name_elem.get_text().strip():
+            for rank, name_elem in enumerate(name_nodes):
+                if name_elem is not None:
                     name = name_elem.get_text().strip()
-                    break
-            
-            if not name:
-                name = f"منتج {index + 1}"
-            
-            # استخراج السعر
-            price_selectors = ['.price', '.product-price', '.cost']
-            price = 0
-            for selector in price_selectors:
-                price_elem = element.select_one(selector)
-                if price_elem:
-                    price_text = price_elem.get_text()
-                    price_match = re.search(r'([\d,]+\.?\d*)', price_text)
-                    if price_match:
-                        price = float(price_match.group(1).replace(',', ''))
+                    if name:
+                        selector = plan.name_selectors[rank]
+                        self.metrics.inc('name_selector_hits', selector=selector)
+                        if hits is not None:
+                            hits[0][selector] = hits[0].get(selector, 0) + 1
                         break
             
-            # إذا لم نجد سعر في عناصر محددة، نبحث في النص العام
-            if price == 0:
-                text = element.get_text()
-                price_match = re.search(r'([\d,]+\.?\d*)\s*جنيه', text)
-                if price_match:
-                    price = float(price_match.group(1).replace(',', ''))
+            # نصوص السعر بترتيب أولوية المحددات، وتحويلها يتم دفعة واحدة للصفحة
+            price_texts = [(rank, price_elem.get_text()) for rank, price_elem in enumerate(price_nodes)
+                           if price_elem is not None]
             
             # استخراج الصورة
-            img_elem = element.find('img')
-            image = 'https://via.placeholder.com/200x200/f0f0f0/999?text=لا+توجد+صورة'
-            if img_elem:
+            src = None
+            if img_elem is not None:
                 src = img_elem.get('data-src') or img_elem.get('src')
-                if src and 'loader.svg' not in src:
-                    if src.startswith('http'):
-                        image = src
-                    elif src.startswith('//'):
-                        image = 'https:' + src
-                    elif src.startswith('/'):
-                        image = urljoin(base_url, src)
-            
-            # استخراج الكود
-            code = (element.get('data-product-id') or 
-                   (element.select_one('[data-product-id]') and element.select_one('[data-product-id]').get('data-product-id')) or
-                   f"PROD_{int(time.time())}_{index}")
             
-            # تحديد حالة التوفر
-            text = element.get_text().lower()
-            status = 'غير متوفر' if any(word in text for word in ['غير متوفر', 'نفدت', 'out of stock']) else 'متوفر'
-            
-            if name and price > 0:
-                return {
-                    'code': code,
-                    'name': name,
-                    'image': image,
-                    'price': price,
-                    'currency': 'جنيه',
-                    'status': status,
-                    'extracted_at': datetime.now().isoformat()
-                }
+            return index, name, price_texts, src, code, element.get_text(' '), link
             
         except Exception as e:
-            print(f"خطأ في استخراج المنتج: {e}")
+            self.metrics.inc('product_errors')
+            self._log(f"خطأ في استخراج المنتج {index}: {e}")
+        
+        return None
+    
+    def _build_products(self, rows: List[Tuple], base_url: Optional[str], plan: Optional[ExtractionPlan] = None,
+                        hits: Optional[Tuple[Dict[str, int], Dict[str, int]]] = None) -> List[Dict]:
+        """تحويل أسعار وحالات جميع منتجات الصفحة دفعة واحدة ثم بناء السجلات"""
+        # عمود واحد لجميع نصوص الأسعار المرشحة، والسعر هو أول نص ناجح بترتيب المحددات
+        candidates = [(row, rank, text) for row, fields in enumerate(rows) for rank, text in fields[2]]
+        prices, currencies = parse_prices([text for _, _, text in candidates])
+        row_prices = [0.0] * len(rows)
+        row_currencies = [None] * len(rows)
+        for (row, rank, _), price, currency in zip(candidates, prices, currencies):
+            if price and not row_prices[row]:
+                row_prices[row] = price
+                row_currencies[row] = currency
+                if plan is not None:
+                    selector = plan.price_selectors[rank]
+                    self.metrics.inc('price_selector_hits', selector=selector)
+                    if hits is not None:
+                        hits[1][selector] = hits[1].get(selector, 0) + 1
+        
+        # إذا لم نجد سعر في عناصر محددة، نبحث عن رقم بجانب عملة في النص العام
+        texts = [fields[5] for fields in rows]
+        missing = [row for row, price in enumerate(row_prices) if not price]
+        if missing:
+            fallback = parse_prices([texts[row] for row in missing], require_currency=True)
+            for row, price, currency in zip(missing, *fallback):
+                row_prices[row] = price
+                row_currencies[row] = currency
+        
+        # الرابط المشترك بين عدة بطاقات لا يصلح هوية للمنتج
+        links = unique_product_links([fields[6] for fields in rows], base_url)
+        
+        products = []
+        for fields, price, currency, available, link in zip(rows, row_prices, row_currencies,
+                                                            classify_stock(texts), links):
+            index, name, _, src, code, text, _ = fields
+            try:
+                product = self._build_product(index, name, price, src, code, text, base_url, link,
+                                              available=available, currency=currency)
+            except Exception as e:
+                self.metrics.inc('product_errors')
+                self._log(f"خطأ في استخراج المنتج {index}: {e}")
+                continue
+            if product:
+                products.append(product)
+        return products
+    
+    def _build_product(self, index: int, name: Optional[str], price: float, src: Optional[str],
+                       code: Optional[str], text: str, base_url: Optional[str],
+                       link: Optional[str] = None, available: Optional[bool] = None,
+                       currency: Optional[Currency] = None) -> Optional[Dict]:
+        """بناء سجل المنتج من الحقول الخام"""
+        # إذا لم نجد سعر في عناصر محددة، نبحث في النص العام
+        if not price:
+            price, currency = parse_price(text, require_currency=True)
+        
+        image = PLACEHOLDER_IMAGE
+        if src and 'loader.svg' not in src:
+            if src.startswith('http'):
+                image = src
+            elif src.startswith('//'):
+                image = 'https:' + src
+            elif src.startswith('/') and base_url:
+                image = urljoin(base_url, src)
+        
+        # كود ثابت بين التشغيلات عند غياب data-product-id (لا يعتمد على ترتيب المنتج في الصفحة)
+        if not code:
+            code = stable_product_code(name or '', image, link, base_url)
         
+        if not name:
+            name = f"منتج {index + 1}"
+        
+        # تحديد حالة التوفر
+        if available is None:
+            available = classify_stock([text])[0]
+        status = ProductStatus.AVAILABLE if available else ProductStatus.UNAVAILABLE
+        currency = currency or Currency.EGP
+        
+        if name and price > 0:
+            if self.compact_records:
+                return Product(code, name, image, price, currency, status, extracted_at=self.run_timestamp)
+            return {
+                'code': code,
+                'name': name,
+                'image': image,
+                'price': price,
+                'currency': currency.value,
+                'status': status.value,
+                'extracted_at': datetime.now().isoformat()
+            }
         return None
     
-    def _extract_product_from_element_selenium(self, element, index: int) -> Optional[Dict]:
+    def _extract_product_from_element_selenium(self, element, index: int, base_url: Optional[str] = None,
+                                               link: Optional[str] = None) -> Optional[Dict]:
         """استخراج منتج من عنصر Selenium"""
+        By = _selenium().By
         try:
             # استخراج الاسم
-            name = f"منتج {index + 1}"
-            name_selectors = ['.product-title', '.product-name', 'h1', 'h2', 'h3', 'h4', '.title', '.name']
-            for selector in name_selectors:
+            name = None
+            for selector in NAME_SELECTORS:
                 try:
                     name_elem = element.find_element(By.CSS_SELECTOR, selector)
                     if name_elem.text.strip():
@@ -258,69 +815,64 @@ class WholesaleProductExtractor:
                     continue
             
             # استخراج السعر
-            price = 0
-            price_selectors = ['.price', '.product-price', '.cost']
-            for selector in price_selectors:
+            price, currency = 0, None
+            for selector in PRICE_SELECTORS:
                 try:
                     price_elem = element.find_element(By.CSS_SELECTOR, selector)
-                    price_text = price_elem.text
-                    price_match = re.search(r'([\d,]+\.?\d*)', price_text)
-                    if price_match:
-                        price = float(price_match.group(1).replace(',', ''))
+                    price, currency = parse_price(price_elem.text)
+                    if price:
                         break
                 except:
                     continue
             
-            # إذا لم نجد سعر، نبحث في النص العام
-            if price == 0:
-                text = element.text
-                price_match = re.search(r'([\d,]+\.?\d*)\s*جنيه', text)
-                if price_match:
-                    price = float(price_match.group(1).replace(',', ''))
-            
             # استخراج الصورة
-            image = 'https://via.placeholder.com/200x200/f0f0f0/999?text=لا+توجد+صورة'
+            src = None
             try:
                 img_elem = element.find_element(By.TAG_NAME, 'img')
                 src = img_elem.get_attribute('data-src') or img_elem.get_attribute('src')
-                if src and 'loader.svg' not in src:
-                    if src.startswith('http'):
-                        image = src
-                    elif src.startswith('//'):
-                        image = 'https:' + src
             except:
                 pass
             
             # استخراج الكود
-            code = f"PROD_{int(time.time())}_{index}"
+            code = None
             try:
-                code = element.get_attribute('data-product-id') or code
+                code = element.get_attribute('data-product-id')
             except:
                 pass
             
-            # تحديد حالة التوفر
-            text = element.text.lower()
-            status = 'غير متوفر' if any(word in text for word in ['غير متوفر', 'نفدت', 'out of stock']) else 'متوفر'
-            
-            if name and price > 0:
-                return {
-                    'code': code,
-                    'name': name,
-                    'image': image,
-                    'price': price,
-                    'currency': 'جنيه',
-                    'status': status,
-                    'extracted_at': datetime.now().isoformat()
-                }
+            return self._build_product(index, name, price, src, code, element.text, base_url, link,
+                                       currency=currency)
             
         except Exception as e:
-            print(f"خطأ في استخراج المنتج: {e}")
+            self.metrics.inc('product_errors')
+            self._log(f"خطأ في استخراج المنتج: {e}")
         
         return None
     
+    def _selenium_link(self, element) -> Optional[str]:
+        """رابط بطاقة Selenium الأول، أو None"""
+        try:
+            return element.find_element(_selenium().By.CSS_SELECTOR, 'a[href]').get_attribute('href')
+        except:
+            return None
+    
+    def _harvest_products_selenium(self, driver, base_url: str) -> List[Dict]:
+        """استخراج جميع بطاقات المنتجات باستدعاء JavaScript واحد"""
+        result = driver.execute_script(HARVEST_SCRIPT, PRODUCT_SELECTORS, NAME_SELECTORS, PRICE_SELECTORS)
+        if result['selector']:
+            self._log(f"وجد {len(result['items'])} عنصر باستخدام {result['selector']}")
+        
+        rows = [(i, item['name'], list(enumerate(item['prices'])), item['image'], item['code'], item['text'],
+                 item['link']) for i, item in enumerate(result['items'])]
+        products = self._build_products(rows, base_url)
+        
+        self._log(f"تم استخراج {len(products)} منتج باستخدام Selenium")
+        return products
+    
     def _get_demo_products(self) -> List[Dict]:
         """بيانات تجريبية"""
-        return [
+        self.metrics.inc('demo_fallbacks')
+        products = [
             {
                 'code': '2984',
                 'name': 'عرض (بلاشر سائل نارس درجه 101 Orange +بلاشر سائل نارس درجه 101 Orange+بلاشر سائل نارس درجه 103 Red+بلاشر سائل نارس درجه 104 Mahogany )',
@@ -358,82 +910,63 @@ class WholesaleProductExtractor:
                 'extracted_at': datetime.now().isoformat()
             }
         ]
+        if self.compact_records:
+            return [Product.from_dict(p) for p in products]
+        return products
     
-    def save_to_csv(self, products: List[Dict], filename: str = 'wholesale_products.csv'):
+    def save_to_csv(self, products: Iterable[Dict], filename: str = 'wholesale_products.csv') -> Optional[Dict]:
         """حفظ المنتجات في ملف CSV"""
-        if not products:
-            print("لا توجد منتجات لحفظها")
-            return
-        
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            fieldnames = ['كود المنتج', 'اسم المنتج', 'السعر', 'العملة', 'الحالة', 'رابط الصورة', 'تاريخ الاستخراج']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for product in products:
-                writer.writerow({
-                    'كود المنتج': product['code'],
-                    'اسم المنتج': product['name'],
-                    'السعر': product['price'],
-                    'العملة': product['currency'],
-                    'الحالة': product['status'],
-                    'رابط الصورة': product['image'],
-                    'تاريخ الاستخراج': product['extracted_at']
-                })
-        
-        print(f"تم حفظ {len(products)} منتج في {filename}")
-    
-    def save_to_json(self, products: List[Dict], filename: str = 'wholesale_products.json'):
+        return self.save_to_file(products, filename, 'csv')
+    
+    def save_to_json(self, products: Iterable[Dict], filename: str = 'wholesale_products.json') -> Optional[Dict]:
         """حفظ المنتجات في ملف JSON"""
-        if not products:
-            print("لا توجد منتجات لحفظها")
-            return
-        
-        with open(filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump({
-                'products': products,
-                'total_count': len(products),
-                'extracted_at': datetime.now().isoformat(),
-                'available_count': len([p for p in products if p['status'] == 'متوفر']),
-                'unavailable_count': len([p for p in products if p['status'] == 'غير متوفر'])
-            }, jsonfile, ensure_ascii=False, indent=2)
-        
-        print(f"تم حفظ {len(products)} منتج في {filename}")
+        return self.save_to_file(products, filename, 'json')
+    
+    def save_to_file(self, products: Iterable[Dict], filename: str, fmt: Optional[str] = None) -> Optional[Dict]:
+        """حفظ المنتجات تدريجياً من قائمة أو مولد (csv, json, ndjson, parquet)"""
+        products = iter(products)
+        first = next(products, None)
+        if first is None:
+            self._log("لا توجد منتجات لحفظها")
+            return None
+        
+        with open_sink(filename, fmt) as sink:
+            sink.write(first)
+            summary = sink.write_all(products)
+        
+        self._log(f"تم حفظ {summary['total_count']} منتج في {filename}")
+        return summary
 
 def main():
     """الدالة الرئيسية"""
     print("🛒 مرحباً بك في مستخرج منتجات سوق الجملة")
     print("=" * 50)
     
+    if not SELENIUM_AVAILABLE:
+        print("تحذير: Selenium غير مثبت. سيتم استخدام requests فقط.")
+        print("لتثبيت Selenium: pip install selenium")
+    
     extractor = WholesaleProductExtractor()
     
-    # قائمة المواقع المدعومة
-    websites = {
-        '1': {
-            'name': 'سوق الجملة - المتجر الرئيسي',
-            'url': 'https://souqgomlaa.almatjar.store/ar/shop'
-        },
-        '2': {
-            'name': 'طلبات - منطقة سوق الجملة',
-            'url': 'https://www.talabat.com/ar/egypt/groceries/7081/souq-el-gomla'
-        }
-    }
+    # قائمة المواقع المدعومة من سجل المحولات
+    websites = {str(i): site for i, site in enumerate(supported_sites(), 1)}
+    custom_choice = str(len(websites) + 1)
     
     print("المواقع المتاحة:")
     for key, site in websites.items():
-        print(f"{key}. {site['name']}")
-    print("3. إدخال رابط مخصص")
+        print(f"{key}. {site.display_name}")
+    print(f"{custom_choice}. إدخال رابط مخصص")
     
-    choice = input("اختر رقم الموقع (1-3): ").strip()
+    choice = input(f"اختر رقم الموقع (1-{custom_choice}): ").strip()
     
     if choice in websites:
-        url = websites[choice]['url']
-        print(f"تم اختيار: {websites[choice]['name']}")
-    elif choice == '3':
+        url = websites[choice].default_url
+        print(f"تم اختيار: {websites[choice].display_name}")
+    elif choice == custom_choice:
         url = input("أدخل رابط الموقع: ").strip()
     else:
         print("اختيار غير صحيح، سيتم استخدام الموقع الافتراضي")
-        url = websites['1']['url']
+        url = websites['1'].default_url
     
     # اختيار طريقة الاستخراج
     use_selenium = False
@@ -445,12 +978,18 @@ def main():
         else:
             print("سيتم استخدام requests (أسرع ولكن قد يفشل مع المواقع الديناميكية)")
     
+    # الزحف على جميع صفحات الترقيم والأقسام
+    crawl = False
+    if not use_selenium:
+        crawl_choice = input("هل تريد زحف جميع صفحات المتجر? (y/n): ").strip().lower()
+        crawl = crawl_choice in ['y', 'yes', 'نعم']
+    
     print(f"بدء استخراج المنتجات من: {url}")
     print("=" * 50)
     
     # بدء عملية الاستخراج
     start_time = time.time()
-    products = extractor.extract_from_souq_gomla(url, use_selenium)
+    products = extractor.extract_from_souq_gomla(url, use_selenium, crawl)
     end_time = time.time()
     
     print("=" * 50)
@@ -478,4 +1017,8 @@ def main():
         print("لم يتم استخراج أي منتجات. تحقق من الرابط أو جرب طريقة استخراج أخرى.")
 
 if __name__ == "__main__":
+    # مع وجود معاملات يعمل المستخرج بدون أسئلة تفاعلية (انظر cli.py)
+    if len(sys.argv) > 1:
+        from cli import main as cli_main
+        sys.exit(cli_main())
     main()
\ No newline at end of file
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ذاكرة مؤقتة دائمة لاستجابات HTTP على القرص
+تحفظ ETag و Last-Modified مع المحتوى مضغوطاً لإرسال طلبات شرطية في التشغيلات اللاحقة
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+class HTTPCache:
+    """ذاكرة مؤقتة للاستجابات مع إزالة الأقدم استخداماً عند تجاوز الحجم"""
+    
+    INDEX_FILE = 'index.json'
+    
+    def __init__(self, cache_dir: str = '.http_cache', max_bytes: int = 200 * 1024 * 1024, autosave_every: int = 100):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.autosave_every = autosave_every
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._pending_changes = 0
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._total_bytes = sum(entry['size'] for entry in self._index.values())
+    
+    def _load_index(self) -> 'OrderedDict[str, Dict]':
+        """قراءة فهرس الذاكرة المؤقتة بترتيب آخر استخدام"""
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with open(path, encoding='utf-8') as f:
+                return OrderedDict(json.load(f))
+        except (OSError, ValueError):
+            return OrderedDict()
+    
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + suffix)
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """ترويسات الطلب الشرطي لرابط محفوظ"""
+        with self._lock:
+            entry = self._index.get(url)
+            if not entry:
+                return {}
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            return headers
+    
+    def get_body(self, url: str) -> Optional[bytes]:
+        """قراءة المحتوى المحفوظ لرابط"""
+        return self._read(url, '.body.gz')
+    
+    def get_payload(self, url: str) -> Optional[Dict]:
+        """قراءة نتيجة التحليل المحفوظة لرابط"""
+        data = self._read(url, '.payload.gz')
+        return json.loads(data.decode('utf-8')) if data is not None else None
+    
+    def _read(self, url: str, suffix: str) -> Optional[bytes]:
+        with self._lock:
+            if url not in self._index:
+                return None
+        try:
+            with gzip.open(self._path(url, suffix), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def record_hit(self, url: str):
+        """تسجيل استجابة 304 وتحديث ترتيب الاستخدام"""
+        with self._lock:
+            self.hits += 1
+            if url in self._index:
+                self._index.move_to_end(url)
+                self._changed()
+    
+    def record_miss(self, url: str):
+        """تسجيل تحميل كامل للصفحة"""
+        with self._lock:
+            self.misses += 1
+    
+    def store(self, url: str, headers, body: bytes):
+        """حفظ استجابة قابلة للتحقق الشرطي"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        
+        with self._lock:
+            self._discard(url)
+            size = self._write(url, '.body.gz', body)
+            self._index[url] = {'etag': etag, 'last_modified': last_modified, 'size': size, 'payload_size': 0}
+            self._total_bytes += size
+            self._evict()
+            self._changed()
+    
+    def store_payload(self, url: str, payload: Dict):
+        """حفظ نتيجة تحليل الصفحة لتخطي التحليل عند عدم تغيرها"""
+        with self._lock:
+            entry = self._index.get(url)
+            if not entry:
+                return
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            size = self._write(url, '.payload.gz', data)
+            self._total_bytes += size - entry['payload_size']
+            entry['size'] += size - entry['payload_size']
+            entry['payload_size'] = size
+            self._evict()
+            self._changed()
+    
+    def _write(self, url: str, suffix: str, data: bytes) -> int:
+        path = self._path(url, suffix)
+        with gzip.open(path, 'wb', compresslevel=6) as f:
+            f.write(data)
+        return os.path.getsize(path)
+    
+    def _discard(self, url: str):
+        entry = self._index.pop(url, None)
+        if entry:
+            self._total_bytes -= entry['size']
+            for suffix in ('.body.gz', '.payload.gz'):
+                try:
+                    os.remove(self._path(url, suffix))
+                except OSError:
+                    pass
+    
+    def _evict(self):
+        """إزالة الأقدم استخداماً حتى يعود الحجم ضمن الحد"""
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            self._discard(oldest)
+            self.evictions += 1
+    
+    def _changed(self):
+        self._pending_changes += 1
+        if self._pending_changes >= self.autosave_every:
+            self.flush()
+    
+    def flush(self):
+        """حفظ الفهرس على القرص"""
+        with self._lock:
+            path = os.path.join(self.cache_dir, self.INDEX_FILE)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, path)
+            self._pending_changes = 0
+    
+    def stats(self) -> Dict:
+        """إحصائيات الذاكرة المؤقتة"""
+        with self._lock:
+            return {
+                'entries': len(self._index),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+هوية ثابتة للمنتجات بين الصفحات والتشغيلات وفهرس سريع لإزالة التكرار
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import hashlib
+from collections import Counter
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse
+
+from normalization import normalize_text
+
+def _digest(value: str, size: int = 8) -> bytes:
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=size).digest()
+
+# معاملات التتبع لا تميز المنتج (مثل /product?id=5&utm_source=x)
+TRACKING_PARAMS = {'fbclid', 'gclid', 'msclkid', 'yclid', 'ref', 'referrer', 'source', 'from'}
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param.startswith('utm_') or param in TRACKING_PARAMS
+
+def product_link_key(link: Optional[str], base_url: Optional[str] = None) -> Optional[str]:
+    """مفتاح رابط صفحة المنتج (النطاق والمسار والاستعلام بدون معاملات التتبع)، أو None إذا لم يكن رابط منتج"""
+    if not link or link.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+        return None
+    if base_url:
+        link = urljoin(base_url, link)
+    parsed = urlparse(link)
+    path = parsed.path.rstrip('/')
+    if parsed.scheme not in ('http', 'https') or not path:
+        return None
+    # روابط تعود لنفس الصفحة (مثل إضافة للسلة) لا تميز المنتج
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if not _is_tracking(k)))
+    if base_url and path == urlparse(base_url).path.rstrip('/') and not query:
+        return None
+    key = f"{parsed.netloc.lower()}{path}"
+    return f"{key}?{query}" if query else key
+
+def unique_product_links(links: List[Optional[str]], base_url: Optional[str] = None) -> List[Optional[str]]:
+    """إبقاء روابط البطاقات الفريدة في الصفحة فقط؛ الرابط المشترك (مثل /cart أو /wishlist) لا يميز المنتج"""
+    keys = [product_link_key(link, base_url) for link in links]
+    counts = Counter(key for key in keys if key)
+    return [link if key and counts[key] == 1 else None for link, key in zip(links, keys)]
+
+def stable_product_code(name: str, image: Optional[str] = None, link: Optional[str] = None,
+                        base_url: Optional[str] = None) -> str:
+    """كود ثابت للمنتج من رابطه، أو من بصمة الاسم الموحد والصورة"""
+    link_key = product_link_key(link, base_url)
+    if link_key:
+        source = 'url:' + link_key
+    else:
+        image_key = urlparse(image).path if image else ''
+        source = 'content:' + normalize_text(name) + '|' + image_key
+    return 'PROD_' + _digest(source).hex()
+
+class DedupIndex:
+    """فهرس إزالة تكرار يحفظ بصمة 64 بت لكل مفتاح بدلاً من النص الكامل"""
+    
+    def __init__(self):
+        self._seen = set()
+    
+    def _fingerprint(self, key: str) -> int:
+        return int.from_bytes(_digest(key), 'big')
+    
+    def add(self, key: str) -> bool:
+        """إضافة مفتاح وإرجاع True إذا كان جديداً"""
+        fingerprint = self._fingerprint(key)
+        if fingerprint in self._seen:
+            return False
+        self._seen.add(fingerprint)
+        return True
+    
+    def __contains__(self, key: str) -> bool:
+        return self._fingerprint(key) in self._seen
+    
+    def __len__(self) -> int:
+        return len(self._seen)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مرحلة اختيارية لتحميل صور المنتجات
+تحمل الصور بالتوازي وتخزن كل صورة مرة واحدة حسب بصمة المحتوى وتنشئ صوراً مصغرة
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# روابط لا تستحق التحميل (صور بديلة)
+SKIPPED_HOSTS = {'via.placeholder.com'}
+
+class ImagePipeline:
+    """تحميل الصور بالتوازي مع إزالة التكرار حسب المحتوى وذاكرة للصور المصغرة"""
+    
+    INDEX_FILE = 'index.json'
+    
+    def __init__(self, cache_dir: str = 'product_images', workers: int = 8,
+                 thumbnail_size: Optional[Tuple[int, int]] = (200, 200), timeout: float = 30,
+                 session: Optional[requests.Session] = None, log: Callable[[str], None] = print):
+        self.cache_dir = cache_dir
+        self.log = log
+        self.workers = workers
+        self.thumbnail_size = thumbnail_size if PIL_AVAILABLE else None
+        self.timeout = timeout
+        
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+        
+        self.stats = {'downloaded': 0, 'cached': 0, 'deduplicated': 0, 'failed': 0, 'skipped': 0,
+                      'bytes_downloaded': 0, 'bytes_saved': 0}
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.join(cache_dir, 'objects'), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, 'thumbnails'), exist_ok=True)
+        self._index = self._load_index()
+        self._hashes = {entry['sha256']: entry for entry in self._index.values()}
+    
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(path + '.tmp', path)
+    
+    def process(self, products: Iterable) -> List:
+        """تحميل صور المنتجات وإضافة المسارات المحلية إلى كل منتج"""
+        products = list(products)
+        # إزالة تكرار الروابط قبل الفحص ليُحسب كل رابط متخطى مرة واحدة
+        unique_urls = dict.fromkeys(product['image'] for product in products)
+        urls = [url for url in unique_urls if self._should_fetch(url)]
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            entries = dict(zip(urls, pool.map(self._fetch, urls)))
+        self._save_index()
+        
+        for product in products:
+            entry = entries.get(product['image'])
+            if entry:
+                product['image_path'] = entry['path']
+                product['thumbnail_path'] = entry.get('thumbnail')
+        
+        self.log(f"الصور: تم تحميل {self.stats['downloaded']}، من الذاكرة {self.stats['cached']}، "
+                 f"مكررة {self.stats['deduplicated']} (توفير {self.stats['bytes_saved']} بايت)")
+        return products
+    
+    def _should_fetch(self, url: Optional[str]) -> bool:
+        if not url or not url.startswith(('http://', 'https://')):
+            return False
+        if urlparse(url).netloc in SKIPPED_HOSTS:
+            with self._lock:
+                self.stats['skipped'] += 1
+            return False
+        return True
+    
+    def _fetch(self, url: str) -> Optional[Dict]:
+        """تحميل صورة واحدة أو إرجاعها من الذاكرة"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry and os.path.exists(entry['path']):
+                self.stats['cached'] += 1
+                return entry
+        
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self.log(f"خطأ في تحميل الصورة {url}: {e}")
+            with self._lock:
+                self.stats['failed'] += 1
+            return None
+        
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        
+        with self._lock:
+            self.stats['downloaded'] += 1
+            self.stats['bytes_downloaded'] += len(content)
+            existing = self._hashes.get(digest)
+            if existing:
+                # نفس المحتوى محفوظ من رابط آخر
+                self.stats['deduplicated'] += 1
+                self.stats['bytes_saved'] += len(content)
+                self._index[url] = existing
+                return existing
+        
+        extension = self._extension(url, response.headers.get('Content-Type'))
+        path = os.path.join(self.cache_dir, 'objects', digest[:2], digest + extension)
+        self._write_atomic(path, lambda f: f.write(content))
+        
+        entry = {'sha256': digest, 'path': path, 'size': len(content),
+                 'thumbnail': self._make_thumbnail(content, digest)}
+        with self._lock:
+            self._hashes.setdefault(digest, entry)
+            self._index[url] = self._hashes[digest]
+            return self._index[url]
+    
+    def _make_thumbnail(self, content: bytes, digest: str) -> Optional[str]:
+        """إنشاء صورة مصغرة (تتطلب Pillow)"""
+        if not self.thumbnail_size:
+            return None
+        path = os.path.join(self.cache_dir, 'thumbnails', digest + '.jpg')
+        if os.path.exists(path):
+            return path
+        try:
+            with Image.open(io.BytesIO(content)) as image:
+                image.thumbnail(self.thumbnail_size)
+                thumbnail = image.convert('RGB')
+            self._write_atomic(path, lambda f: thumbnail.save(f, 'JPEG', quality=85))
+            return path
+        except Exception as e:
+            self.log(f"تعذر إنشاء صورة مصغرة: {e}")
+            return None
+    
+    @staticmethod
+    def _write_atomic(path: str, write: Callable):
+        """الكتابة في ملف مؤقت فريد ثم استبداله، فلا يتعارض تحميلان متزامنان لنفس المحتوى"""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    @staticmethod
+    def _extension(url: str, content_type: Optional[str]) -> str:
+        extension = os.path.splitext(urlparse(url).path)[1].lower()
+        if extension in ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.avif'):
+            return extension
+        if content_type:
+            return mimetypes.guess_extension(content_type.split(';')[0].strip()) or ''
+        return ''
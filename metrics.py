@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مقاييس الأداء لمستخرج المنتجات
+عدادات ومؤقتات آمنة للخيوط مع مصدّرات بصيغة Prometheus وسجل JSON
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# مفتاح العداد: (الاسم، التسميات مرتبة)
+CounterKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+class Metrics:
+    """عدادات ومؤقتات المستخرج مع مصدّرات قابلة للإضافة"""
+    
+    def __init__(self, exporters: Optional[List] = None):
+        self.exporters = list(exporters or [])
+        self._lock = threading.Lock()
+        self._counters: Dict[CounterKey, float] = {}
+        self._timers: Dict[str, List[float]] = {}
+    
+    def inc(self, name: str, value: float = 1, **labels: str):
+        """زيادة عداد"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, name: str, seconds: float):
+        """تسجيل مدة مرحلة (العدد والمجموع والأقصى)"""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+    
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """قياس زمن كتلة من الكود"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+    
+    def counter(self, name: str, **labels: str) -> float:
+        """قيمة عداد واحد"""
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+    
+    def selector_hit_rates(self) -> Dict[str, float]:
+        """نسبة نجاح كل محدد منتجات إلى عدد مرات تجربته"""
+        with self._lock:
+            probes = {dict(labels)['selector']: value for (name, labels), value in self._counters.items()
+                      if name == 'selector_probes'}
+            hits = {dict(labels)['selector']: value for (name, labels), value in self._counters.items()
+                    if name == 'selector_hits'}
+        return {selector: round(hits.get(selector, 0) / count, 4) for selector, count in probes.items() if count}
+    
+    def snapshot(self) -> Dict:
+        """نسخة من جميع المقاييس قابلة للتحويل إلى JSON"""
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            timers = {name: {'count': count, 'sum': round(total, 6), 'max': round(peak, 6)}
+                      for name, (count, total, peak) in sorted(self._timers.items())}
+        return {'counters': counters, 'timers': timers, 'selector_hit_rates': self.selector_hit_rates()}
+    
+    def merge(self, snapshot: Dict):
+        """دمج مقاييس من عملية أخرى (مثل عمليات التحليل في خط الاستخراج)"""
+        for counter in snapshot['counters']:
+            self.inc(counter['name'], counter['value'], **counter['labels'])
+        with self._lock:
+            for name, other in snapshot['timers'].items():
+                timer = self._timers.get(name)
+                if timer is None:
+                    self._timers[name] = [other['count'], other['sum'], other['max']]
+                else:
+                    timer[0] += other['count']
+                    timer[1] += other['sum']
+                    timer[2] = max(timer[2], other['max'])
+    
+    def reset(self):
+        """تصفير جميع المقاييس"""
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+    
+    def export(self):
+        """إرسال المقاييس الحالية إلى جميع المصدّرات"""
+        if not self.exporters:
+            return
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            exporter.export(snapshot)
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class PrometheusExporter:
+    """كتابة المقاييس بصيغة Prometheus النصية (لمجمّع textfile في node_exporter)"""
+    
+    def __init__(self, path: str, prefix: str = 'wholesale_'):
+        self.path = path
+        self.prefix = prefix
+    
+    def render(self, snapshot: Dict) -> str:
+        """تحويل المقاييس إلى نص Prometheus"""
+        lines = []
+        declared = set()
+        for counter in snapshot['counters']:
+            name = f"{self.prefix}{counter['name']}_total"
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} counter")
+            labels = ','.join(f'{key}="{_escape_label(str(value))}"' for key, value in counter['labels'].items())
+            lines.append(f"{name}{{{labels}}} {counter['value']}" if labels else f"{name} {counter['value']}")
+        
+        for timer_name, timer in snapshot['timers'].items():
+            name = f"{self.prefix}{timer_name}_seconds"
+            lines.append(f"# TYPE {name} summary")
+            lines.append(f"{name}_count {timer['count']}")
+            lines.append(f"{name}_sum {timer['sum']}")
+            lines.append(f"# TYPE {name}_max gauge")
+            lines.append(f"{name}_max {timer['max']}")
+        return '\n'.join(lines) + '\n'
+    
+    def export(self, snapshot: Dict):
+        # كتابة ذرية حتى لا يقرأ المجمّع ملفاً ناقصاً
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render(snapshot))
+        os.replace(tmp_path, self.path)
+
+class JSONLogExporter:
+    """إضافة سطر JSON لكل تصدير إلى ملف سجل"""
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def export(self, snapshot: Dict):
+        record = {'timestamp': datetime.now().isoformat(), **snapshot}
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+سجل منتج مضغوط بديل عن القواميس لكل منتج
+يستخدم __slots__ وقيماً ثابتة للحالة والعملة وطابعاً زمنياً رقمياً مشتركاً للتشغيل
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import sys
+import time
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Optional, Union
+
+class ProductStatus(str, Enum):
+    """حالة توفر المنتج"""
+    AVAILABLE = 'متوفر'
+    UNAVAILABLE = 'غير متوفر'
+    
+    def __str__(self):
+        return self.value
+
+class Currency(str, Enum):
+    """عملة السعر"""
+    EGP = 'جنيه'
+    SAR = 'ريال'
+    AED = 'درهم'
+    USD = 'دولار'
+    
+    def __str__(self):
+        return self.value
+
+PRODUCT_FIELDS = ('code', 'name', 'image', 'price', 'currency', 'status', 'extracted_at')
+# حقول اختيارية تضيفها مراحل لاحقة (مثل تحميل الصور)
+OPTIONAL_FIELDS = ('image_path', 'thumbnail_path')
+
+@lru_cache(maxsize=256)
+def _isoformat(timestamp: float) -> str:
+    """تحويل الطابع الزمني إلى نص ISO (يتكرر نفس الطابع لكل منتجات التشغيل)"""
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+def _coerce_enum(enum_cls, value):
+    """تحويل النص إلى قيمة ثابتة، أو تخزين النصوص غير المعروفة مرة واحدة"""
+    if isinstance(value, enum_cls):
+        return value
+    member = enum_cls._value2member_map_.get(value)
+    return member if member is not None else sys.intern(str(value))
+
+class Product:
+    """سجل منتج مضغوط يدعم الوصول بأسلوب القاموس للتوافق مع الكود القائم"""
+    
+    __slots__ = PRODUCT_FIELDS + OPTIONAL_FIELDS
+    
+    def __init__(self, code: str, name: str, image: str, price: float,
+                 currency: Union[Currency, str] = Currency.EGP,
+                 status: Union[ProductStatus, str] = ProductStatus.AVAILABLE,
+                 extracted_at: Optional[float] = None):
+        self.code = code
+        self.name = name
+        self.image = image
+        self.price = price
+        self.currency = _coerce_enum(Currency, currency)
+        self.status = _coerce_enum(ProductStatus, status)
+        self.extracted_at = time.time() if extracted_at is None else extracted_at
+        self.image_path = None
+        self.thumbnail_path = None
+    
+    def __getitem__(self, key: str):
+        if key not in PRODUCT_FIELDS and key not in OPTIONAL_FIELDS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if key == 'extracted_at':
+            return _isoformat(value)
+        if isinstance(value, Enum):
+            return value.value
+        return value
+    
+    def __setitem__(self, key: str, value):
+        if key not in OPTIONAL_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def keys(self):
+        return PRODUCT_FIELDS
+    
+    def __eq__(self, other):
+        if not isinstance(other, Product):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in PRODUCT_FIELDS)
+    
+    def __repr__(self):
+        return f"Product(code={self.code!r}, name={self.name!r}, price={self.price!r}, status={self.status.value!r})"
+    
+    def to_dict(self) -> Dict:
+        """تحويل السجل إلى قاموس بنفس بنية المنتجات القديمة"""
+        data = {field: self[field] for field in PRODUCT_FIELDS}
+        for field in OPTIONAL_FIELDS:
+            if getattr(self, field) is not None:
+                data[field] = getattr(self, field)
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Product':
+        """إنشاء سجل من قاموس منتج"""
+        extracted_at = data.get('extracted_at')
+        if isinstance(extracted_at, str):
+            extracted_at = datetime.fromisoformat(extracted_at).timestamp()
+        product = cls(
+            code=data['code'],
+            name=data['name'],
+            image=data['image'],
+            price=data['price'],
+            currency=data.get('currency', Currency.EGP),
+            status=data.get('status', ProductStatus.AVAILABLE),
+            extracted_at=extracted_at
+        )
+        for field in OPTIONAL_FIELDS:
+            setattr(product, field, data.get(field))
+        return product
+
+def as_dict(product: Union[Product, Dict]) -> Dict:
+    """محول يقبل سجل Product أو قاموساً ويعيد قاموساً قابلاً للتحويل إلى JSON"""
+    return product.to_dict() if isinstance(product, Product) else product
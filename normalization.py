@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+أدوات توحيد النصوص العربية لمقارنة المنتجات والبحث فيها
+وتحويل أعمدة الأسعار والحالات الخام لصفحة كاملة دفعة واحدة
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from models import Currency
+
+# الأرقام العربية الهندية والفارسية إلى أرقام لاتينية
+DIGITS_TABLE = str.maketrans('٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹', '01234567890123456789')
+
+# توحيد أشكال الحروف وحذف التشكيل والتطويل
+ARABIC_TABLE = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ة': 'ه', 'ؤ': 'و', 'ئ': 'ي',
+    'ـ': None,
+    **{chr(code): None for code in range(0x064B, 0x0653)},
+    'ٰ': None
+})
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+def normalize_text(text: str) -> str:
+    """توحيد النص للمقارنة: الأرقام وأشكال الحروف والتشكيل وحالة الأحرف والمسافات"""
+    text = text.translate(DIGITS_TABLE).translate(ARABIC_TABLE).casefold()
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+# جدول واحد للأسعار: الأرقام وفواصلها العربية ومسافات الطباعة وعلامات الاتجاه
+PRICE_TABLE = {**DIGITS_TABLE, **str.maketrans({
+    '٫': '.', '٬': ',',
+    '\u00a0': ' ', '\u2009': ' ', '\u202f': ' ',
+    '\u200e': None, '\u200f': None, '\u061c': None
+})}
+PRICE_TABLE_RE = re.compile('[' + ''.join(map(chr, PRICE_TABLE)) + ']')
+
+# رموز العملات كما تظهر في المتاجر (بعد تحويل النص بجدول الأسعار)
+CURRENCY_SYMBOLS = {
+    Currency.EGP: (r'جنيه', r'جنية', r'ج\.\s?م\.?', r'\begp\b', r'\bl\.e\b\.?'),
+    Currency.SAR: (r'ريال', r'ر\.\s?س\.?', r'\bsar\b'),
+    Currency.AED: (r'درهم', r'د\.\s?إ\.?', r'\baed\b'),
+    Currency.USD: (r'دولار', r'\busd\b', r'\$')
+}
+_CURRENCY = '|'.join(symbol for symbols in CURRENCY_SYMBOLS.values() for symbol in symbols)
+_CURRENCY_RES = [(currency, re.compile('|'.join(symbols), re.IGNORECASE))
+                 for currency, symbols in CURRENCY_SYMBOLS.items()]
+
+# رقم بفواصل آلاف أو فاصلة عشرية والعملة بعده، والعملة قبل الرقم تُفحص في نافذة صغيرة قبله
+_NUMBER = r'\d+(?:[.,]\d+)*'
+PRICE_RE = re.compile(rf'({_NUMBER})(?:\s*({_CURRENCY}))?', re.IGNORECASE)
+CURRENCY_BEFORE_RE = re.compile(rf'({_CURRENCY})\s*$', re.IGNORECASE)
+CURRENCY_BEFORE_WINDOW = 12
+# نص كامل من الدفعة في كل مطابقة: (ما قبل أول رقم، أول رقم، العملة بعده)
+FIRST_PRICE_RE = re.compile(rf'([^\d\x00]*)(?:({_NUMBER})(?:\s*({_CURRENCY}))?)?[^\x00]*(?:\x00|\Z)', re.IGNORECASE)
+# سعر مع عملة قبله أو بعده (للبحث عن نصوص الأسعار في الصفحة)
+CURRENCY_PRICE_RE = re.compile(rf'({_CURRENCY})\s*({_NUMBER})|({_NUMBER})\s*({_CURRENCY})', re.IGNORECASE)
+CURRENCY_RE = re.compile(_CURRENCY, re.IGNORECASE)
+
+# كلمات عدم التوفر بصيغتها الموحدة
+OUT_OF_STOCK_WORDS = ['غير متوفر', 'غير متاح', 'نفد', 'out of stock', 'sold out', 'unavailable']
+
+def _variants_pattern(word: str) -> str:
+    """تعبير يطابق الكلمة في النص الخام بكل أشكال حروفها مع التشكيل والتطويل، بدلاً من توحيد النص كاملاً"""
+    variants = {}
+    for source, target in ARABIC_TABLE.items():
+        if target is not None:
+            variants.setdefault(target, [target]).append(chr(source))
+    marks = '[' + ''.join(chr(source) for source, target in ARABIC_TABLE.items() if target is None) + ']*'
+    parts = []
+    for char in word:
+        if char == ' ':
+            parts.append(r'\s+')
+        elif char in variants:
+            parts.append('[' + ''.join(variants[char]) + ']' + marks)
+        else:
+            parts.append(re.escape(char) + marks)
+    return ''.join(parts)
+
+# بدون IGNORECASE: تحويل الدفعة بـ lower مرة واحدة أسرع بكثير من مطابقة غير حساسة لحالة الأحرف
+OUT_OF_STOCK_RE = re.compile('|'.join(map(_variants_pattern, OUT_OF_STOCK_WORDS)))
+
+# فاصل بين نصوص الدفعة لا يطابقه أي تعبير سعر أو حالة
+_SEPARATOR = '\x00'
+
+def parse_number(number: str) -> float:
+    """تحويل رقم بفواصل (1,250.50 أو 1.250,50 أو 100,50) إلى قيمة"""
+    comma, dot = number.rfind(','), number.rfind('.')
+    if comma < 0 and dot == number.find('.'):
+        # الحالة الشائعة: بدون فواصل أو بفاصلة عشرية واحدة
+        pass
+    elif comma >= 0 and dot >= 0:
+        # الفاصل الأخير هو الفاصلة العشرية والآخر فاصل آلاف
+        thousands, decimal = (',', '.') if dot > comma else ('.', ',')
+        number = number.replace(thousands, '').replace(decimal, '.')
+    elif comma >= 0:
+        # فاصلة واحدة يتبعها رقمان أو أقل (100,50) فاصلة عشرية، وغير ذلك فواصل آلاف
+        if number.count(',') == 1 and len(number) - comma - 1 < 3:
+            number = number.replace(',', '.')
+        else:
+            number = number.replace(',', '')
+    else:
+        number = number.replace('.', '')
+    try:
+        return float(number)
+    except ValueError:
+        return 0
+
+@lru_cache(maxsize=64)
+def detect_currency(symbol: Optional[str]) -> Optional[Currency]:
+    """العملة المقابلة لرمز أو نص (جنيه، ج.م، EGP، $ ...)"""
+    if symbol:
+        for currency, pattern in _CURRENCY_RES:
+            if pattern.search(symbol):
+                return currency
+    return None
+
+def _batch(texts: Sequence[str], transform: Callable[[str], str]) -> Tuple[str, List[int]]:
+    """دمج النصوص في نص واحد وتحويله مرة واحدة، مع بداية كل نص بعد التحويل"""
+    joined = transform(_SEPARATOR.join(texts))
+    starts = [0]
+    starts.extend(accumulate(len(part) + 1 for part in joined.split(_SEPARATOR)[:-1]))
+    return joined, starts
+
+def _price_text(text: str) -> str:
+    # التحويل بالجدول بطيء نسبياً، فلا يتم إلا عند وجود أرقام أو فواصل عربية
+    return text.translate(PRICE_TABLE) if PRICE_TABLE_RE.search(text) else text
+
+def parse_prices(texts: Sequence[str], require_currency: bool = False) -> Tuple[List[float], List[Optional[Currency]]]:
+    """تحويل عمود نصوص أسعار إلى عمودي (السعر، العملة) بأول رقم في كل نص
+    
+    مع require_currency لا يُقبل إلا رقم بجانبه عملة (للبحث في نص المنتج كاملاً)
+    """
+    prices = [0.0] * len(texts)
+    currencies = [None] * len(texts)
+    if not texts:
+        return prices, currencies
+    
+    if require_currency:
+        return _parse_currency_prices(texts, prices, currencies)
+    
+    # مطابقة واحدة لكل نص بدلاً من البحث عن موضع كل رقم
+    joined = _price_text(_SEPARATOR.join(texts))
+    for row, (prefix, number, symbol) in enumerate(FIRST_PRICE_RE.findall(joined)[:len(texts)]):
+        if not number:
+            continue
+        if not symbol:
+            before = CURRENCY_BEFORE_RE.search(prefix[-CURRENCY_BEFORE_WINDOW:])
+            symbol = before.group(1) if before else None
+        prices[row] = float(number) if number.isdigit() else parse_number(number)
+        currencies[row] = detect_currency(symbol)
+    return prices, currencies
+
+def _parse_currency_prices(texts: Sequence[str], prices: List[float],
+                           currencies: List[Optional[Currency]]) -> Tuple[List[float], List[Optional[Currency]]]:
+    """أول رقم بجانبه عملة في كل نص"""
+    joined, starts = _batch(texts, _price_text)
+    last = -1
+    for match in PRICE_RE.finditer(joined):
+        start = match.start()
+        row = bisect_right(starts, start) - 1
+        if row == last:
+            continue
+        number, symbol = match.groups()
+        if symbol is None:
+            before = CURRENCY_BEFORE_RE.search(joined, max(starts[row], start - CURRENCY_BEFORE_WINDOW), start)
+            if not before:
+                continue
+            symbol = before.group(1)
+        price = parse_number(number)
+        if price:
+            prices[row] = price
+            currencies[row] = detect_currency(symbol)
+            last = row
+    return prices, currencies
+
+def parse_price(text: str, require_currency: bool = False) -> Tuple[float, Optional[Currency]]:
+    """تحويل نص سعر واحد إلى (السعر، العملة)"""
+    prices, currencies = parse_prices([text], require_currency)
+    return prices[0], currencies[0]
+
+def classify_stock(texts: Sequence[str]) -> List[bool]:
+    """تحديد توفر كل منتج من نصه دفعة واحدة (False عند وجود كلمة عدم توفر)"""
+    available = [True] * len(texts)
+    if not texts:
+        return available
+    
+    joined, starts = _batch(texts, str.lower)
+    for match in OUT_OF_STOCK_RE.finditer(joined):
+        available[bisect_right(starts, match.start()) - 1] = False
+    return available
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+خط استخراج يفصل التحميل عن التحليل
+خيوط التحميل تضع محتوى الصفحات في طابور محدود، ومجمع عمليات يحلل الصفحات على جميع الأنوية
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urldefrag
+
+from extractor import WholesaleProductExtractor
+from identity import DedupIndex
+
+# مستخرج خاص بكل عملية تحليل
+_worker_extractor = None
+
+def _init_worker(parser: str, compact_records: bool):
+    """تهيئة عملية التحليل (مرة واحدة لكل عملية)"""
+    global _worker_extractor
+    # رسائل التحليل من العمليات الفرعية لا تفيد وتتداخل مع المخرجات
+    _worker_extractor = WholesaleProductExtractor(parser=parser, compact_records=compact_records, quiet=True)
+
+def _parse_worker(url: str, content: bytes, limit: Optional[int], discover_links: bool) -> Tuple[List, List[str], Dict]:
+    """تحليل صفحة داخل عملية التحليل وإرجاع مقاييسها لدمجها في العملية الرئيسية"""
+    _worker_extractor.metrics.reset()
+    soup = _worker_extractor._make_soup(content)
+    products = _worker_extractor._parse_products_from_soup(soup, url, limit)
+    links = _worker_extractor._discover_links(soup, url) if discover_links else []
+    return products, links, _worker_extractor.metrics.snapshot()
+
+class ParsePipeline:
+    """خط استخراج: خيوط للتحميل وطابور محدود ومجمع عمليات للتحليل"""
+    
+    def __init__(self, extractor: Optional[WholesaleProductExtractor] = None, parse_workers: Optional[int] = None,
+                 fetch_workers: int = 8, queue_size: int = 32, limit: Optional[int] = None):
+        self.extractor = extractor or WholesaleProductExtractor()
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.fetch_workers = fetch_workers
+        # حجم الطابور يحدد الضغط العكسي: يتوقف التحميل عندما يمتلئ
+        self.queue_size = queue_size
+        self.limit = limit
+        self.stats = {}
+    
+    def run(self, urls: Iterable[str], follow_links: bool = False, max_pages: int = 200) -> List:
+        """تشغيل الخط وإرجاع جميع المنتجات"""
+        return list(self.iter_products(urls, follow_links, max_pages))
+    
+    def iter_products(self, urls: Iterable[str], follow_links: bool = False, max_pages: int = 200) -> Iterator:
+        """إرجاع المنتجات فور تحليل كل صفحة"""
+        stats = {'pages': 0, 'failed_pages': 0, 'products': 0, 'duplicates': 0,
+                 'elapsed': 0.0, 'pages_per_second': 0.0, 'products_per_second': 0.0}
+        self.stats = stats
+        start_time = time.time()
+        
+        url_queue = queue.Queue()
+        raw_queue = queue.Queue(maxsize=self.queue_size)
+        seen_urls = set()
+        seen_products = DedupIndex()
+        outstanding = 0
+        
+        for url in urls:
+            url = urldefrag(url)[0]
+            if url not in seen_urls:
+                seen_urls.add(url)
+                url_queue.put(url)
+                outstanding += 1
+        
+        # يوقف خيوط التحميل إذا توقف المستهلك مبكراً (إغلاق المولد أو استثناء)
+        stop = threading.Event()
+        fetchers = [threading.Thread(target=self._fetch_loop, args=(url_queue, raw_queue, stop), daemon=True)
+                    for _ in range(self.fetch_workers)]
+        for fetcher in fetchers:
+            fetcher.start()
+        
+        max_in_flight = self.parse_workers * 2
+        pending = {}
+        
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers, initializer=_init_worker,
+                                     initargs=(self.extractor.parser, self.extractor.compact_records)) as pool:
+                while outstanding:
+                    # نقل الصفحات المحملة إلى عمليات التحليل
+                    while len(pending) < max_in_flight:
+                        try:
+                            url, content, error = raw_queue.get(timeout=0.05 if pending else None)
+                        except queue.Empty:
+                            break
+                        if error is not None:
+                            outstanding -= 1
+                            stats['failed_pages'] += 1
+                            self.extractor.metrics.inc('failed_pages')
+                            self.extractor._log(f"خطأ في تحميل الصفحة {url}: {error}")
+                            if not outstanding:
+                                break
+                            continue
+                        pending[pool.submit(_parse_worker, url, content, self.limit, follow_links)] = url
+                    
+                    if not pending:
+                        continue
+                    
+                    done, _ = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url = pending.pop(future)
+                        outstanding -= 1
+                        try:
+                            products, links, worker_metrics = future.result()
+                        except Exception as e:
+                            stats['failed_pages'] += 1
+                            self.extractor.metrics.inc('failed_pages')
+                            self.extractor._log(f"خطأ في تحليل الصفحة {url}: {e}")
+                            continue
+                        
+                        self.extractor.metrics.merge(worker_metrics)
+                        stats['pages'] += 1
+                        for link in links:
+                            if link not in seen_urls and len(seen_urls) < max_pages:
+                                seen_urls.add(link)
+                                url_queue.put(link)
+                                outstanding += 1
+                        
+                        for product in products:
+                            if not seen_products.add(product['code']):
+                                stats['duplicates'] += 1
+                                continue
+                            stats['products'] += 1
+                            yield product
+        finally:
+            stop.set()
+            for _ in fetchers:
+                url_queue.put(None)
+            elapsed = time.time() - start_time
+            stats['elapsed'] = elapsed
+            if elapsed > 0:
+                stats['pages_per_second'] = stats['pages'] / elapsed
+                stats['products_per_second'] = stats['products'] / elapsed
+    
+    def _fetch_loop(self, url_queue: queue.Queue, raw_queue: queue.Queue, stop: threading.Event):
+        """خيط تحميل: يأخذ الروابط ويضع المحتوى في الطابور المحدود حتى يُطلب التوقف"""
+        while not stop.is_set():
+            url = url_queue.get()
+            if url is None or stop.is_set():
+                break
+            try:
+                content, _ = self.extractor._fetch_content(url)
+                item = (url, content, None)
+            except Exception as e:
+                item = (url, None, e)
+            # الطابور الممتلئ لا يحجز الخيط بعد توقف المستهلك
+            while not stop.is_set():
+                try:
+                    raw_queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مخزن منتجات دائم (SQLite) مع سجل تاريخي للأسعار والتوفر
+يسمح بمقارنة التشغيلات واكتشاف تغيرات الأسعار دون إعادة قراءة ملفات CSV/JSON
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS products (
+    code TEXT PRIMARY KEY,
+    name TEXT,
+    image TEXT,
+    price REAL,
+    currency TEXT,
+    status TEXT,
+    first_run INTEGER,
+    last_run INTEGER,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS price_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    code TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    observed_at REAL NOT NULL,
+    price REAL,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_price_history_code_time ON price_history (code, observed_at);
+CREATE INDEX IF NOT EXISTS idx_price_history_run ON price_history (run_id);
+"""
+
+class ProductStore:
+    """مخزن منتجات مفهرس بكود المنتج مع سجل إضافي فقط للأسعار والحالة"""
+    
+    def __init__(self, path: str = 'wholesale_products.db', log: Callable[[str], None] = print):
+        self.path = path
+        self.log = log
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """إغلاق قاعدة البيانات"""
+        self.conn.close()
+    
+    def start_run(self, source: Optional[str] = None) -> int:
+        """تسجيل تشغيل جديد وإرجاع رقمه"""
+        with self.conn:
+            cursor = self.conn.execute('INSERT INTO runs (started_at, source) VALUES (?, ?)', (time.time(), source))
+        return cursor.lastrowid
+    
+    def latest_run_id(self) -> Optional[int]:
+        """رقم آخر تشغيل"""
+        row = self.conn.execute('SELECT MAX(run_id) FROM runs').fetchone()
+        return row[0]
+    
+    def upsert_products(self, products: Iterable, run_id: int) -> Dict:
+        """إدخال أو تحديث المنتجات دفعة واحدة وإضافة سجل تاريخي للجديد والمتغير فقط"""
+        now = time.time()
+        rows = ((p['code'], p['name'], p['image'], p['price'], p['currency'], p['status']) for p in products)
+        
+        with self.conn:
+            self.conn.execute('DROP TABLE IF EXISTS temp.staging')
+            self.conn.execute('CREATE TEMP TABLE staging (code TEXT PRIMARY KEY, name TEXT, image TEXT, '
+                              'price REAL, currency TEXT, status TEXT)')
+            self.conn.executemany('INSERT OR REPLACE INTO staging VALUES (?, ?, ?, ?, ?, ?)', rows)
+            
+            new_count = self.conn.execute(
+                'SELECT COUNT(*) FROM staging s LEFT JOIN products p ON p.code = s.code WHERE p.code IS NULL'
+            ).fetchone()[0]
+            
+            history = self.conn.execute(
+                'INSERT INTO price_history (code, run_id, observed_at, price, status) '
+                'SELECT s.code, ?, ?, s.price, s.status FROM staging s '
+                'LEFT JOIN products p ON p.code = s.code '
+                'WHERE p.code IS NULL OR p.price IS NOT s.price OR p.status IS NOT s.status',
+                (run_id, now)
+            )
+            
+            self.conn.execute(
+                'INSERT INTO products (code, name, image, price, currency, status, first_run, last_run, updated_at) '
+                'SELECT code, name, image, price, currency, status, ?, ?, ? FROM staging WHERE true '
+                'ON CONFLICT (code) DO UPDATE SET name = excluded.name, image = excluded.image, '
+                'price = excluded.price, currency = excluded.currency, status = excluded.status, '
+                'last_run = excluded.last_run, updated_at = excluded.updated_at',
+                (run_id, run_id, now)
+            )
+            total = self.conn.execute('SELECT COUNT(*) FROM staging').fetchone()[0]
+            self.conn.execute('DROP TABLE temp.staging')
+        
+        return {
+            'total_count': total,
+            'new_count': new_count,
+            'changed_count': history.rowcount - new_count
+        }
+    
+    def save_products(self, products: Iterable, source: Optional[str] = None) -> int:
+        """حفظ نتائج تشغيل كامل وإرجاع رقم التشغيل"""
+        run_id = self.start_run(source)
+        summary = self.upsert_products(products, run_id)
+        self.log(f"تم حفظ {summary['total_count']} منتج في {self.path} "
+                 f"(جديد: {summary['new_count']}، متغير: {summary['changed_count']})")
+        return run_id
+    
+    def diff_since(self, run_id: int) -> List[Dict]:
+        """المنتجات التي تغير سعرها أو توفرها بعد التشغيل المحدد"""
+        rows = self.conn.execute(
+            'SELECT p.code, p.name, p.image, p.price AS new_price, p.status AS new_status, '
+            '       base.price AS old_price, base.status AS old_status '
+            'FROM products p '
+            'JOIN price_history base ON base.id = ('
+            '    SELECT h.id FROM price_history h WHERE h.code = p.code AND h.run_id <= ? '
+            '    ORDER BY h.observed_at DESC, h.id DESC LIMIT 1) '
+            'WHERE p.code IN (SELECT code FROM price_history WHERE run_id > ?) '
+            '  AND (p.price IS NOT base.price OR p.status IS NOT base.status)',
+            (run_id, run_id)
+        )
+        return [dict(row) for row in rows]
+    
+    def history(self, code: str) -> List[Dict]:
+        """السجل التاريخي لسعر وحالة منتج"""
+        rows = self.conn.execute(
+            'SELECT run_id, observed_at, price, status FROM price_history WHERE code = ? ORDER BY observed_at',
+            (code,)
+        )
+        return [dict(row) for row in rows]
+    
+    def get(self, code: str) -> Optional[Dict]:
+        """قراءة منتج بالكود"""
+        row = self.conn.execute('SELECT * FROM products WHERE code = ?', (code,)).fetchone()
+        return dict(row) if row else None
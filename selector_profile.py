@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ملفات المحددات لكل نطاق
+تسجل المحددات التي نجحت في كل موقع لتجربتها أولاً في التشغيلات اللاحقة وتخطي المحددات الفاشلة
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+class SelectorProfile:
+    """إحصائيات نجاح المحددات في نطاق واحد"""
+    
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self.pages = data.get('pages', 0)
+        self.product = dict(data.get('product', {}))
+        self.name = dict(data.get('name', {}))
+        self.price = dict(data.get('price', {}))
+    
+    def to_dict(self) -> Dict:
+        return {'pages': self.pages, 'product': self.product, 'name': self.name, 'price': self.price}
+    
+    @staticmethod
+    def _ranked(hits: Dict[str, int]) -> List[str]:
+        return sorted(hits, key=hits.get, reverse=True)
+    
+    def product_selectors(self, defaults: List[str]) -> List[str]:
+        """المحددات الناجحة أولاً ثم بقية المحددات بترتيبها الأصلي"""
+        learned = self._ranked(self.product)
+        return learned + [selector for selector in defaults if selector not in self.product]
+    
+    def name_selectors(self, defaults: List[str]) -> List[str]:
+        """محددات الاسم الناجحة فقط (أو جميع المحددات إذا لم يتعلم شيئاً)"""
+        return self._ranked(self.name) or list(defaults)
+    
+    def price_selectors(self, defaults: List[str]) -> List[str]:
+        """محددات السعر الناجحة فقط (أو جميع المحددات إذا لم يتعلم شيئاً)"""
+        return self._ranked(self.price) or list(defaults)
+    
+    def reset(self):
+        """نسيان ما تم تعلمه بعد تغير تخطيط الموقع"""
+        self.pages = 0
+        self.product.clear()
+        self.name.clear()
+        self.price.clear()
+
+class SelectorProfileStore:
+    """ملفات المحددات لجميع النطاقات محفوظة في ملف JSON"""
+    
+    VERSION = 1
+    
+    def __init__(self, path: str = 'selector_profiles.json', min_pages: int = 3, autosave_every: int = 20):
+        self.path = path
+        # عدد الصفحات الناجحة قبل الاعتماد على الملف وتقليص المحددات
+        self.min_pages = min_pages
+        self.autosave_every = autosave_every
+        self._lock = threading.Lock()
+        self._pending_changes = 0
+        self._profiles = self._load()
+    
+    def _load(self) -> Dict[str, SelectorProfile]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != self.VERSION:
+            return {}
+        return {host: SelectorProfile(profile) for host, profile in data.get('hosts', {}).items()}
+    
+    def get(self, url: str) -> SelectorProfile:
+        """ملف المحددات لنطاق الرابط"""
+        host = urlparse(url).netloc
+        with self._lock:
+            profile = self._profiles.get(host)
+            if profile is None:
+                profile = self._profiles[host] = SelectorProfile()
+            return profile
+    
+    def learned(self, profile: SelectorProfile, product_defaults: List[str], name_defaults: List[str],
+                price_defaults: List[str]) -> Optional[Tuple[List[str], List[str], List[str]]]:
+        """قوائم المحددات المعاد ترتيبها (المنتج والاسم والسعر)، أو None إذا لم يتعلم الملف ما يكفي بعد"""
+        with self._lock:
+            if profile.pages < self.min_pages or not profile.product:
+                return None
+            return (profile.product_selectors(product_defaults), profile.name_selectors(name_defaults),
+                    profile.price_selectors(price_defaults))
+    
+    def record_page(self, profile: SelectorProfile, product_selector: str,
+                    name_hits: Dict[str, int], price_hits: Dict[str, int]):
+        """تسجيل المحددات التي نجحت في صفحة واحدة"""
+        with self._lock:
+            profile.pages += 1
+            profile.product[product_selector] = profile.product.get(product_selector, 0) + 1
+            for selector, count in name_hits.items():
+                profile.name[selector] = profile.name.get(selector, 0) + count
+            for selector, count in price_hits.items():
+                profile.price[selector] = profile.price.get(selector, 0) + count
+            self._pending_changes += 1
+            autosave = self._pending_changes >= self.autosave_every
+        if autosave:
+            self.flush()
+    
+    def invalidate(self, profile: SelectorProfile):
+        """إعادة تعلم النطاق من البداية"""
+        with self._lock:
+            profile.reset()
+            self._pending_changes += 1
+    
+    def flush(self):
+        """حفظ الملفات على القرص إذا تغيرت"""
+        with self._lock:
+            if not self._pending_changes:
+                return
+            data = {'version': self.VERSION,
+                    'hosts': {host: profile.to_dict() for host, profile in self._profiles.items() if profile.pages}}
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            self._pending_changes = 0
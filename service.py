@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+خدمة HTTP طويلة التشغيل لمستخرج المنتجات (بديل بايثون لـ server.js)
+تحافظ على جلسة HTTP ومجمع متصفحات دافئين، وتدمج الطلبات المتزامنة لنفس الرابط في استخراج واحد،
+وتخدم النتائج الحديثة من ذاكرة مؤقتة، وتبث المنتجات تدريجياً (SSE أو NDJSON)
+
+الاستخدام:
+    python service.py --port 3000
+    curl -X POST localhost:3000/api/extract -d '{"url": "https://souqgomlaa.almatjar.store/ar/shop"}'
+    curl -N "localhost:3000/api/extract/stream?url=https://souqgomlaa.almatjar.store/ar/shop&crawl=1"
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from fnmatch import fnmatchcase
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urldefrag, urlparse
+
+from extractor import SELENIUM_AVAILABLE, WholesaleProductExtractor
+from http_cache import HTTPCache
+from models import as_dict
+
+# ملفات الواجهة الأمامية المسموح بتقديمها فقط (لا مجلدات ولا ملفات مخفية أو بيانات)
+STATIC_FILES = ('index.html', 'script.js', 'style*.css', '*-integration.js')
+
+# أسماء طرق server.js وما يقابلها في المستخرج
+METHODS = {'requests': 'requests', 'axios': 'requests', 'selenium': 'selenium', 'puppeteer': 'selenium'}
+
+class _Broadcast:
+    """نتيجة استخراج جارٍ يشترك فيها عدة طلبات، كل مشترك يقرأ المنتجات فور وصولها"""
+    
+    def __init__(self):
+        self.products = []
+        self.error = None
+        self.done = False
+        self.finished_at = None
+        self._cond = threading.Condition()
+    
+    def publish(self, products: List[Dict]):
+        with self._cond:
+            self.products.extend(products)
+            self._cond.notify_all()
+    
+    def finish(self, error: Optional[Exception] = None):
+        with self._cond:
+            self.error = error
+            self.done = True
+            self.finished_at = datetime.now().isoformat()
+            self._cond.notify_all()
+    
+    def subscribe(self) -> Iterator[Dict]:
+        """المنتجات من البداية ثم الجديدة حتى انتهاء الاستخراج، ويرفع خطأ الاستخراج إن وجد"""
+        position = 0
+        while True:
+            with self._cond:
+                while position == len(self.products) and not self.done:
+                    self._cond.wait()
+                batch = self.products[position:]
+                position += len(batch)
+                finished = self.done and position == len(self.products)
+                error = self.error
+            yield from batch
+            if finished:
+                if error is not None:
+                    raise error
+                return
+
+class ExtractionService:
+    """مستخرج دافئ مشترك مع دمج الطلبات المتزامنة وذاكرة نتائج بمدة صلاحية"""
+    
+    def __init__(self, extractor: Optional[WholesaleProductExtractor] = None, ttl: float = 300,
+                 max_entries: int = 256, workers: int = 4, max_pages: int = 200):
+        self.extractor = extractor or WholesaleProductExtractor(demo_fallback=False)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_pages = max_pages
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        # المفتاح -> (وقت انتهاء الصلاحية، البث المكتمل)
+        self._results = OrderedDict()
+        self._inflight = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'extractions': 0, 'failures': 0}
+    
+    def stream(self, url: str, method: str = 'requests', crawl: bool = False) -> Tuple[_Broadcast, bool]:
+        """الحصول على بث الاستخراج لرابط، ويعيد (البث، من الذاكرة المؤقتة)"""
+        key = (urldefrag(url)[0], METHODS.get(method, 'requests'), bool(crawl))
+        with self._lock:
+            self.stats['requests'] += 1
+            cached = self._results.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self._results.move_to_end(key)
+                    self.stats['cache_hits'] += 1
+                    return cached[1], True
+                del self._results[key]
+            
+            broadcast = self._inflight.get(key)
+            if broadcast is not None:
+                self.stats['coalesced'] += 1
+                return broadcast, False
+            
+            broadcast = self._inflight[key] = _Broadcast()
+            self.stats['extractions'] += 1
+        
+        self._pool.submit(self._run, key, broadcast)
+        return broadcast, False
+    
+    def extract(self, url: str, method: str = 'requests', crawl: bool = False) -> Tuple[List[Dict], bool]:
+        """استخراج كامل (مع الدمج والذاكرة المؤقتة)، ويعيد (المنتجات، من الذاكرة المؤقتة)"""
+        broadcast, cached = self.stream(url, method, crawl)
+        return list(broadcast.subscribe()), cached
+    
+    def _run(self, key: Tuple[str, str, bool], broadcast: _Broadcast):
+        """تشغيل الاستخراج ونشر المنتجات للمشتركين"""
+        url, method, crawl = key
+        error = None
+        try:
+            if crawl and method == 'requests':
+                # الزحف يعيد المنتجات صفحة بصفحة فتصل للمشتركين تدريجياً
+                page = []
+                for product in self.extractor.iter_crawl(url, max_pages=self.max_pages):
+                    page.append(as_dict(product))
+                    if len(page) >= 20:
+                        broadcast.publish(page)
+                        page = []
+                broadcast.publish(page)
+            elif method == 'selenium' and SELENIUM_AVAILABLE:
+                broadcast.publish([as_dict(p) for p in self.extractor._extract_with_selenium(url)])
+            else:
+                broadcast.publish([as_dict(p) for p in self.extractor._extract_with_requests(url)])
+        except Exception as e:
+            error = e
+        
+        broadcast.finish(error)
+        with self._lock:
+            del self._inflight[key]
+            if error is not None:
+                # لا تُحفظ الأخطاء حتى يعيد الطلب التالي المحاولة
+                self.stats['failures'] += 1
+                return
+            self._results[key] = (time.monotonic() + self.ttl, broadcast)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+    
+    def health(self) -> Dict:
+        with self._lock:
+            return {'status': 'ok', 'cached_results': len(self._results),
+                    'inflight': len(self._inflight), **self.stats}
+    
+    def close(self):
+        self._pool.shutdown(wait=False)
+        self.extractor.close()
+
+class ServiceHandler(SimpleHTTPRequestHandler):
+    """واجهة /api للاستخراج والملفات الثابتة للواجهة الأمامية"""
+    
+    protocol_version = 'HTTP/1.1'
+    service = None
+    
+    def do_OPTIONS(self):
+        if not urlparse(self.path).path.startswith('/api/'):
+            return self.send_error(404)
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == '/api/health':
+            return self._send_json(200, self.service.health())
+        if parsed.path == '/api/extract/stream':
+            # لـ EventSource في المتصفح (يدعم GET فقط)
+            query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            query['crawl'] = query.get('crawl') in ('1', 'true', 'yes')
+            query['stream'] = 'sse'
+            return self._extract(query)
+        if parsed.path.startswith('/api/'):
+            return self._send_json(404, {'success': False, 'error': 'غير موجود'})
+        return self._serve_static(super().do_GET)
+    
+    def do_HEAD(self):
+        return self._serve_static(super().do_HEAD)
+    
+    def _serve_static(self, serve):
+        """تقديم ملفات الواجهة الأمامية من القائمة المسموحة فقط"""
+        name = unquote(urlparse(self.path).path).lstrip('/') or 'index.html'
+        if ('/' in name or '\\' in name or name.startswith('.')
+                or not any(fnmatchcase(name, pattern) for pattern in STATIC_FILES)):
+            return self.send_error(404)
+        self.path = '/' + name
+        return serve()
+    
+    def do_POST(self):
+        if urlparse(self.path).path != '/api/extract':
+            return self._send_json(404, {'success': False, 'error': 'غير موجود'})
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError
+        except ValueError:
+            return self._send_json(400, {'success': False, 'error': 'طلب JSON غير صالح'})
+        if 'text/event-stream' in self.headers.get('Accept', ''):
+            request.setdefault('stream', 'sse')
+        return self._extract(request)
+    
+    def _extract(self, request: Dict):
+        url = request.get('url')
+        if not url:
+            return self._send_json(400, {'error': 'يجب توفير رابط الموقع'})
+        
+        broadcast, cached = self.service.stream(url, request.get('method', 'requests'), request.get('crawl', False))
+        stream = request.get('stream')
+        if stream in ('sse', 'ndjson'):
+            return self._stream(broadcast, url, cached, stream)
+        
+        try:
+            products = list(broadcast.subscribe())
+        except Exception as e:
+            return self._send_json(500, {'success': False, 'error': str(e), 'products': []})
+        self._send_json(200, {
+            'success': True,
+            'products': products,
+            'total': len(products),
+            'extractedAt': broadcast.finished_at,
+            'url': url,
+            'cached': cached
+        })
+    
+    def _stream(self, broadcast: _Broadcast, url: str, cached: bool, fmt: str):
+        """بث المنتجات فور استخراجها بترميز chunked"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8' if fmt == 'sse'
+                         else 'application/x-ndjson; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        
+        def event(name: str, data: Dict) -> bytes:
+            text = json.dumps(data, ensure_ascii=False)
+            if fmt == 'sse':
+                return f"event: {name}\ndata: {text}\n\n".encode('utf-8')
+            return (json.dumps({'event': name, 'data': data}, ensure_ascii=False) + '\n').encode('utf-8')
+        
+        total = 0
+        try:
+            try:
+                for product in broadcast.subscribe():
+                    total += 1
+                    self._write_chunk(event('product', product))
+                self._write_chunk(event('done', {'success': True, 'total': total, 'extractedAt': broadcast.finished_at,
+                                                 'url': url, 'cached': cached}))
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except Exception as e:
+                self._write_chunk(event('error', {'success': False, 'error': str(e), 'total': total}))
+            self._write_chunk(b'')
+        except (BrokenPipeError, ConnectionResetError):
+            # العميل أغلق الاتصال، الاستخراج يستمر لبقية المشتركين
+            pass
+    
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+    
+    def _send_json(self, status: int, data: Dict):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        sys.stderr.write(f"[{self.log_date_time_string()}] {format % args}\n")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='خدمة HTTP لاستخراج منتجات سوق الجملة')
+    parser.add_argument('--host', default='127.0.0.1', help='عنوان الاستماع')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 3000)), help='منفذ الاستماع')
+    parser.add_argument('--ttl', type=float, default=300, help='مدة صلاحية النتائج المحفوظة بالثواني')
+    parser.add_argument('--workers', type=int, default=4, help='عدد عمليات الاستخراج المتزامنة')
+    parser.add_argument('--browser-pool-size', type=int, default=2, help='عدد متصفحات Selenium الدافئة')
+    parser.add_argument('--cache-dir', help='تفعيل ذاكرة HTTP المؤقتة في هذا المجلد')
+    parser.add_argument('--static-dir', default=os.path.dirname(os.path.abspath(__file__)),
+                        help='مجلد ملفات الواجهة الأمامية (تُقدم منه ملفات STATIC_FILES فقط)')
+    args = parser.parse_args(argv)
+    
+    extractor = WholesaleProductExtractor(
+        cache=HTTPCache(args.cache_dir) if args.cache_dir else None,
+        browser_pool_size=args.browser_pool_size,
+        demo_fallback=False,
+        quiet=True
+    )
+    service = ExtractionService(extractor, ttl=args.ttl, workers=args.workers)
+    handler = type('Handler', (ServiceHandler,), {'service': service})
+    server = ThreadingHTTPServer((args.host, args.port), partial(handler, directory=args.static_dir))
+    server.daemon_threads = True
+    
+    print(f"خدمة استخراج المنتجات تعمل على http://{args.host}:{args.port}")
+    print("API لاستخراج المنتجات: POST /api/extract")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nتم إيقاف الخدمة")
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+محولات خاصة بكل موقع لاستخراج المنتجات مباشرة من بيانات JSON المضمنة
+تقرأ __NEXT_DATA__ و window.__INITIAL_STATE__ و JSON-LD وتتنقل بين الصفحات،
+ويعود المستخرج لتحليل HTML فقط عند عدم وجود هذه البيانات
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import json
+import re
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from normalization import detect_currency, parse_price
+from throttle import CircuitOpenError
+
+# مواضع بيانات JSON المضمنة في صفحات المتاجر
+JSON_SCRIPT_RES = [
+    re.compile(rb'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I),
+    re.compile(rb'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I),
+    re.compile(rb'window\.__(?:INITIAL_STATE|NUXT|PRELOADED_STATE)__\s*=\s*(\{.*?\})\s*;?\s*</script>', re.S)
+]
+
+NAME_KEYS = ('name', 'title', 'productName', 'product_name', 'name_ar', 'nameAr')
+PRICE_KEYS = ('price', 'salePrice', 'sale_price', 'finalPrice', 'final_price', 'currentPrice', 'sellingPrice')
+CODE_KEYS = ('id', 'sku', 'productId', 'product_id', 'code')
+IMAGE_KEYS = ('image', 'imageUrl', 'image_url', 'images', 'thumbnail', 'thumb', 'photo')
+LINK_KEYS = ('url', 'link', 'slug', 'permalink')
+STOCK_KEYS = ('inStock', 'in_stock', 'isAvailable', 'is_available', 'available', 'availability', 'stock', 'quantity')
+TOTAL_PAGES_KEYS = ('totalPages', 'total_pages', 'lastPage', 'last_page', 'pageCount', 'page_count')
+CURRENCY_KEYS = ('currency', 'priceCurrency', 'currencyCode', 'currency_code')
+
+def find_json_payloads(content: bytes) -> List:
+    """استخراج كتل JSON المضمنة في الصفحة بدون بناء شجرة DOM"""
+    payloads = []
+    for pattern in JSON_SCRIPT_RES:
+        for match in pattern.finditer(content):
+            try:
+                payloads.append(json.loads(match.group(1)))
+            except ValueError:
+                continue
+    return payloads
+
+def _first(data: Dict, keys):
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+def _looks_like_product(data: Dict) -> bool:
+    return _first(data, NAME_KEYS) is not None and (
+        _first(data, PRICE_KEYS) is not None or isinstance(data.get('offers'), (dict, list))
+    )
+
+def iter_product_dicts(data) -> Iterator[Dict]:
+    """البحث عن القواميس التي تشبه المنتجات داخل بيانات JSON"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if _looks_like_product(node):
+                yield node
+                continue
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+def _find_key(data, keys) -> Optional[object]:
+    """أول قيمة لأحد المفاتيح في أي مستوى"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            value = _first(node, keys)
+            if value is not None and not isinstance(value, (dict, list)):
+                return value
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None
+
+def _to_price(value) -> float:
+    if isinstance(value, dict):
+        value = _first(value, ('amount', 'value', 'price'))
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return parse_price(value)[0]
+    return 0
+
+def _to_image(value) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = _first(value, ('url', 'src', 'original', 'large', 'medium'))
+    return value if isinstance(value, str) else None
+
+def _to_available(value) -> Optional[bool]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value > 0
+    text = str(value).lower()
+    if 'outofstock' in text or 'out_of_stock' in text or 'soldout' in text:
+        return False
+    if 'instock' in text or 'in_stock' in text:
+        return True
+    return None
+
+class SiteAdapter:
+    """أساس محولات المواقع: extract يعيد None للرجوع إلى تحليل HTML"""
+    
+    name = 'generic'
+    display_name = ''
+    default_url = None
+    domains = ()
+    
+    def matches(self, url: str) -> bool:
+        host = urlparse(url).netloc.lower()
+        return any(host == domain or host.endswith('.' + domain) for domain in self.domains)
+    
+    def extract(self, extractor, url: str, content: bytes) -> Optional[List[Dict]]:
+        return None
+
+class EmbeddedJSONAdapter(SiteAdapter):
+    """محول يقرأ المنتجات من JSON المضمن ويتنقل بين الصفحات عبر معامل page"""
+    
+    page_param = 'page'
+    max_pages = 50
+    
+    def page_url(self, url: str, page: int) -> str:
+        """رابط صفحة معينة من القائمة"""
+        parsed = urlparse(url)
+        query = [(k, v) for k, v in parse_qsl(parsed.query) if k != self.page_param]
+        query.append((self.page_param, str(page)))
+        return urlunparse(parsed._replace(query=urlencode(query)))
+    
+    def extract(self, extractor, url: str, content: bytes) -> Optional[List[Dict]]:
+        products = []
+        seen = set()
+        
+        for page in range(1, self.max_pages + 1):
+            if page > 1:
+                try:
+                    content, _ = extractor._fetch_content(self.page_url(url, page))
+                except (OSError, CircuitOpenError) as e:
+                    # الاحتفاظ بمنتجات الصفحات السابقة بدلاً من إسقاطها بسبب صفحة واحدة
+                    extractor._log(f"تعذر تحميل الصفحة {page} من {url}: {e}")
+                    break
+            
+            payloads = find_json_payloads(content)
+            new_products = []
+            for item in (item for payload in payloads for item in iter_product_dicts(payload)):
+                product = self.to_product(extractor, item, len(products) + len(new_products), url)
+                if product and product['code'] not in seen:
+                    seen.add(product['code'])
+                    new_products.append(product)
+            
+            if not new_products:
+                break
+            products.extend(new_products)
+            
+            total_pages = _find_key(payloads, TOTAL_PAGES_KEYS)
+            if isinstance(total_pages, int) and page >= total_pages:
+                break
+        
+        return products or None
+    
+    def to_product(self, extractor, item: Dict, index: int, base_url: str) -> Optional[Dict]:
+        """تحويل قاموس منتج من JSON إلى سجل منتج"""
+        offers = item.get('offers')
+        if isinstance(offers, list):
+            offers = offers[0] if offers else None
+        offers = offers if isinstance(offers, dict) else {}
+        
+        price = _to_price(_first(item, PRICE_KEYS) or offers.get('price'))
+        available = _to_available(_first(item, STOCK_KEYS))
+        if available is None:
+            available = _to_available(offers.get('availability'))
+        
+        currency = _first(item, CURRENCY_KEYS) or offers.get('priceCurrency')
+        
+        code = _first(item, CODE_KEYS)
+        link = _first(item, LINK_KEYS)
+        if isinstance(link, str) and not link.startswith(('http', '/')):
+            link = urlparse(base_url).path.rstrip('/') + '/' + link
+        
+        return extractor._build_product(
+            index,
+            str(_first(item, NAME_KEYS)).strip(),
+            price,
+            _to_image(_first(item, IMAGE_KEYS)),
+            str(code) if code is not None else None,
+            '',
+            base_url,
+            link if isinstance(link, str) else None,
+            available=available,
+            currency=detect_currency(currency) if isinstance(currency, str) else None
+        )
+
+class AlmatjarAdapter(EmbeddedJSONAdapter):
+    """متاجر منصة almatjar (سوق الجملة)"""
+    
+    name = 'almatjar'
+    display_name = 'سوق الجملة - المتجر الرئيسي'
+    default_url = 'https://souqgomlaa.almatjar.store/ar/shop'
+    domains = ('almatjar.store',)
+
+class TalabatAdapter(EmbeddedJSONAdapter):
+    """بقالة طلبات (بيانات __NEXT_DATA__)"""
+    
+    name = 'talabat'
+    display_name = 'طلبات - منطقة سوق الجملة'
+    default_url = 'https://www.talabat.com/ar/egypt/groceries/7081/souq-el-gomla'
+    domains = ('talabat.com',)
+
+ADAPTERS: List[SiteAdapter] = []
+
+def register_adapter(adapter: SiteAdapter) -> SiteAdapter:
+    """تسجيل محول موقع جديد (المحولات المسجلة لاحقاً لها الأولوية)"""
+    ADAPTERS.insert(0, adapter)
+    return adapter
+
+def get_adapter(url: str) -> Optional[SiteAdapter]:
+    """المحول المناسب للرابط إن وجد"""
+    for adapter in ADAPTERS:
+        if adapter.matches(url):
+            return adapter
+    return None
+
+def supported_sites() -> List[SiteAdapter]:
+    """المواقع المعروفة التي لها رابط افتراضي"""
+    return [adapter for adapter in reversed(ADAPTERS) if adapter.default_url]
+
+register_adapter(AlmatjarAdapter())
+register_adapter(TalabatAdapter())
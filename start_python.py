@@ -10,12 +10,13 @@ import subprocess
 
 def check_dependencies():
     """تحقق من وجود المتطلبات"""
-    required_packages = ['requests', 'beautifulsoup4']
+    # اسم الحزمة للتثبيت واسم الوحدة للاستيراد
+    required_packages = {'requests': 'requests', 'beautifulsoup4': 'bs4'}
     missing_packages = []
     
-    for package in required_packages:
+    for package, module in required_packages.items():
         try:
-            __import__(package.replace('-', '_'))
+            __import__(module)
         except ImportError:
             missing_packages.append(package)
     
@@ -34,6 +35,15 @@ def install_packages(packages):
     return True
 
 def main():
+    # مع وسائط سطر الأوامر يعمل التشغيل آلياً (cron): بدون أسئلة تفاعلية أو رسائل تسبق ملخص JSON
+    if len(sys.argv) > 1:
+        missing = check_dependencies()
+        if missing:
+            print(f"⚠️ الحزم الناقصة: {', '.join(missing)}", file=sys.stderr)
+            sys.exit(1)
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+    
     print("🚀 بدء تشغيل مستخرج منتجات سوق الجملة (Python)")
     print("=" * 60)
     
@@ -61,14 +71,12 @@ def main():
     print("🚀 جاري تشغيل التطبيق...")
     print("=" * 60)
     
-    # تشغيل التطبيق
+    # تشغيل التطبيق في نفس العملية بدلاً من عملية Python جديدة
     try:
-        subprocess.run([sys.executable, 'extractor.py'], check=True)
-    except subprocess.CalledProcessError:
-        print("⚠️ خطأ في تشغيل التطبيق")
+        from extractor import main as run_extractor
+        run_extractor()
     except KeyboardInterrupt:
-        print("
-🔴 تم إيقاف التطبيق بواسطة المستخدم")
+        print("\n🔴 تم إيقاف التطبيق بواسطة المستخدم")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
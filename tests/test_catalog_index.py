@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبارات البحث النصي في فهرس الكتالوج
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog_index import CatalogIndex
+
+def product(code: int, name: str) -> dict:
+    return {'code': str(code), 'name': name, 'image': '', 'price': 10 + code % 7, 'currency': 'جنيه',
+            'status': 'متوفر', 'extracted_at': ''}
+
+class TextSearchTest(unittest.TestCase):
+    
+    def test_long_word_is_not_matched_by_scattered_trigrams(self):
+        # جميع مقاطع "مكرونا" موجودة في كل صف لكن الكلمة نفسها غير موجودة
+        index = CatalogIndex([product(i, 'زيت كرونا مكر') for i in range(5000)])
+        self.assertEqual(index.query(text='مكرونا')['total'], 0)
+        self.assertEqual(index.query(text='كرونا')['total'], 5000)
+    
+    def test_results_match_substring_search_after_reload(self):
+        names = ['مكرونة فاخرة', 'زيت ذرة', 'أرز مصري', 'مكرونه اسباجتي', 'زيت زيتون']
+        products = [product(i, names[i % len(names)]) for i in range(200)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'catalog.idx')
+            CatalogIndex(products).save(path)
+            index = CatalogIndex.load(path)
+        # التوحيد يجعل ة و ه حرفاً واحداً
+        self.assertEqual(index.query(text='مكرونة')['total'], 80)
+        self.assertEqual(index.query(text='زيتون')['total'], 40)
+        self.assertEqual(index.query(text='ارز', per_page=5)['pages'], 8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبارات الكود الثابت للمنتجات المستخرج من روابط البطاقات
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor import WholesaleProductExtractor
+
+BASE_URL = 'https://shop.example/ar/shop'
+
+def card(i: int, href: str) -> str:
+    return (f'<div class="product-item"><a href="{href}">عرض</a><img src="/p{i}.jpg">'
+            f'<h5 class="product-title">منتج {i}</h5><span class="price">{100 + i} جنيه</span></div>')
+
+class ProductCodeTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.extractor = WholesaleProductExtractor(rate_limit=False, quiet=True)
+    
+    def codes(self, hrefs) -> list:
+        html = ''.join(card(i, href) for i, href in enumerate(hrefs))
+        products = self.extractor._parse_products_from_soup(self.extractor._make_soup(html.encode()), BASE_URL, None)
+        self.assertEqual(len(products), len(hrefs))
+        return [p['code'] for p in products]
+    
+    def test_query_string_links_give_distinct_codes(self):
+        codes = self.codes([f'/product?id={i}&utm_source=feed' for i in range(5)])
+        self.assertEqual(len(set(codes)), 5)
+        # معاملات التتبع لا تغير الكود
+        self.assertEqual(codes, self.codes([f'/product?id={i}' for i in range(5)]))
+    
+    def test_shared_link_falls_back_to_content_hash(self):
+        codes = self.codes(['/wishlist'] * 5)
+        self.assertEqual(len(set(codes)), 5)
+        self.assertEqual(codes, self.codes(['/cart'] * 5))
+
+if __name__ == '__main__':
+    unittest.main()
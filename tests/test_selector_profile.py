@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبارات ملفات المحددات عند تغير تخطيط الموقع
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor import WholesaleProductExtractor
+from selector_profile import SelectorProfileStore
+
+BASE_URL = 'https://shop.example/ar/shop'
+
+def page(name_class: str, count: int = 5) -> str:
+    return ''.join(f'<div class="product-item"><img src="/p{i}.jpg"><h5 class="{name_class}">منتج حقيقي {i}</h5>'
+                   f'<span class="price">{100 + i} جنيه</span></div>' for i in range(count))
+
+class RenamedClassesTest(unittest.TestCase):
+    
+    def test_renamed_name_class_invalidates_profile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SelectorProfileStore(os.path.join(tmp, 'profiles.json'))
+            extractor = WholesaleProductExtractor(rate_limit=False, quiet=True, selector_profiles=store)
+            for _ in range(store.min_pages + 1):
+                extractor._parse_products_from_soup(extractor._make_soup(page('product-title')), BASE_URL, None)
+            
+            products = extractor._parse_products_from_soup(extractor._make_soup(page('product-name')), BASE_URL, None)
+            
+            self.assertEqual([p['name'] for p in products], [f'منتج حقيقي {i}' for i in range(5)])
+            self.assertEqual(extractor.metrics.counter('profile_invalidations'), 1)
+            self.assertEqual(list(store.get(BASE_URL).name), ['.product-name'])
+
+def sparse_page(count: int = 5, priced: int = 2) -> str:
+    """قائمة معظم منتجاتها نفذت وبدون سعر"""
+    return ''.join(f'<div class="product-item"><img src="/p{i}.jpg"><h5 class="product-title">منتج {i}</h5>'
+                   + (f'<span class="price">{100 + i} جنيه</span>' if i < priced else '<span>نفذت الكمية</span>')
+                   + '</div>' for i in range(count))
+
+class SparseListingTest(unittest.TestCase):
+    
+    def test_out_of_stock_pages_keep_profile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SelectorProfileStore(os.path.join(tmp, 'profiles.json'))
+            extractor = WholesaleProductExtractor(rate_limit=False, quiet=True, selector_profiles=store)
+            for _ in range(12):
+                products = extractor._parse_products_from_soup(extractor._make_soup(sparse_page()), BASE_URL, None)
+                self.assertEqual(len(products), 2)
+            
+            self.assertEqual(extractor.metrics.counter('profile_invalidations'), 0)
+            self.assertEqual(store.get(BASE_URL).pages, 12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبارات قاطع الدائرة في محدد معدل الطلبات
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import os
+import sys
+import time
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from throttle import CircuitBreaker, CircuitOpenError, HostThrottle, RetryPolicy
+
+URL = 'https://shop.example/ar/shop'
+RESET_TIMEOUT = 0.05
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.headers = {}
+
+def respond(status_code: int):
+    return lambda: FakeResponse(status_code)
+
+class HalfOpenProbeTest(unittest.TestCase):
+    """كل طلب تجريبي في الحالة نصف المفتوحة يجب أن يسجل نتيجة"""
+    
+    def setUp(self):
+        self.throttle = HostThrottle(rate=1000, burst=10, max_rate=1000, failure_threshold=2,
+                                     reset_timeout=RESET_TIMEOUT, retry_policy=RetryPolicy(max_retries=0))
+        # فتح الدائرة بخطأين متتاليين
+        for _ in range(2):
+            self.throttle.request(URL, respond(503))
+        self.assertEqual(self.circuit(), CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.throttle.request(URL, respond(200))
+    
+    def circuit(self) -> str:
+        return self.throttle.stats()['shop.example']['circuit']
+    
+    def recover(self):
+        time.sleep(RESET_TIMEOUT * 1.5)
+        self.assertEqual(self.throttle.request(URL, respond(200)).status_code, 200)
+        self.assertEqual(self.circuit(), CircuitBreaker.CLOSED)
+    
+    def test_429_probe_reopens_circuit(self):
+        time.sleep(RESET_TIMEOUT * 1.5)
+        self.assertEqual(self.throttle.request(URL, respond(429)).status_code, 429)
+        self.assertEqual(self.circuit(), CircuitBreaker.OPEN)
+        self.recover()
+    
+    def test_unexpected_exception_probe_reopens_circuit(self):
+        def fail():
+            raise ValueError('استجابة غير صالحة')
+        
+        time.sleep(RESET_TIMEOUT * 1.5)
+        with self.assertRaises(ValueError):
+            self.throttle.request(URL, fail)
+        self.assertEqual(self.circuit(), CircuitBreaker.OPEN)
+        self.recover()
+    
+    def test_unrecorded_probe_allows_new_probe_after_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_TIMEOUT)
+        breaker.record_failure()
+        time.sleep(RESET_TIMEOUT * 1.5)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        time.sleep(RESET_TIMEOUT * 1.5)
+        self.assertTrue(breaker.allow())
+
+class RetryExceptionsTest(unittest.TestCase):
+    """إعادة المحاولة لأخطاء الشبكة المؤقتة فقط"""
+    
+    def setUp(self):
+        self.throttle = HostThrottle(rate=1000, burst=10, max_rate=1000, failure_threshold=5,
+                                     retry_policy=RetryPolicy(max_retries=2, backoff_base=0.01))
+        self.calls = 0
+    
+    def send(self, error: Exception):
+        def fail():
+            self.calls += 1
+            raise error
+        return fail
+    
+    def test_invalid_url_fails_without_retry_or_breaker_failure(self):
+        with self.assertRaises(requests.exceptions.InvalidSchema):
+            self.throttle.request(URL, self.send(requests.exceptions.InvalidSchema('htp://')))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.throttle.stats()['shop.example']['circuit'], CircuitBreaker.CLOSED)
+    
+    def test_connection_error_is_retried(self):
+        with self.assertRaises(requests.ConnectionError):
+            self.throttle.request(URL, self.send(requests.ConnectionError('refused')))
+        self.assertGreater(self.calls, 1)
+
+if __name__ == '__main__':
+    unittest.main()
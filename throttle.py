@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تحديد معدل الطلبات لكل نطاق مع إعادة المحاولة وقاطع الدائرة
+يخفض المعدل تلقائياً عند 429 ويحترم Retry-After ثم يرفعه تدريجياً مع نجاح الطلبات
+
+المؤلف: MiniMax Agent
+الإصدار: 1.0.0
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+# أخطاء في الطلب نفسه قبل الوصول إلى النطاق، فلا تُحسب على قاطع الدائرة
+CLIENT_ERRORS = (requests.exceptions.InvalidURL, requests.exceptions.InvalidSchema,
+                 requests.exceptions.MissingSchema, requests.exceptions.InvalidHeader)
+
+class CircuitOpenError(RuntimeError):
+    """النطاق متوقف مؤقتاً بعد تكرار الأخطاء"""
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """قراءة ترويسة Retry-After (ثوانٍ أو تاريخ HTTP)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    # email.utils بطيء الاستيراد ونادراً ما يُحتاج إليه
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class TokenBucket:
+    """دلو رموز بمعدل متكيف: خفض مضاعف عند 429 وزيادة تدريجية عند النجاح"""
+    
+    def __init__(self, rate: float = 2.0, burst: int = 4, min_rate: float = 0.2,
+                 max_rate: float = 10.0, increase_step: float = 0.1):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """انتظار رمز متاح قبل إرسال الطلب"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait_time = (1 - self._tokens) / self.rate
+                else:
+                    wait_time = self._paused_until - now
+            time.sleep(wait_time)
+    
+    def penalize(self, retry_after: Optional[float] = None):
+        """خفض المعدل بعد 429 وإيقاف النطاق حتى Retry-After"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            # بعد انتهاء مهلة Retry-After يسمح بطلب واحد فوراً
+            self._tokens = 1.0 if retry_after else 0.0
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                self._updated = self._paused_until
+    
+    def reward(self):
+        """رفع المعدل تدريجياً بعد طلب ناجح"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+class CircuitBreaker:
+    """قاطع دائرة: يوقف الطلبات بعد عدد من الأخطاء المتتالية ثم يجرب طلباً واحداً بعد مهلة"""
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """هل يسمح بإرسال طلب الآن"""
+        with self._lock:
+            # طلب تجريبي واحد بعد المهلة، وطلب آخر إذا لم تُسجل نتيجة التجربة خلال مهلة كاملة
+            if self.state != self.CLOSED and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return self.state == self.CLOSED
+    
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+    
+    def record_throttled(self):
+        """429 لا يُعد خطأ في الحالة العادية، لكنه يعيد فتح الدائرة إذا كان نتيجة الطلب التجريبي"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+class RetryPolicy:
+    """سياسة إعادة المحاولة بتأخير أسي عشوائي"""
+    
+    def __init__(self, max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+                 retry_exceptions: Tuple[type, ...] = (requests.ConnectionError, requests.Timeout)):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        # أخطاء الشبكة المؤقتة فقط؛ الرابط غير الصالح لن ينجح بإعادة المحاولة
+        self.retry_exceptions = retry_exceptions
+    
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+class HostThrottle:
+    """محدد معدل وقاطع دائرة لكل نطاق مع إعادة المحاولة"""
+    
+    def __init__(self, rate: float = 2.0, burst: int = 4, max_rate: float = 10.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 retry_policy: Optional[RetryPolicy] = None, log: Callable[[str], None] = print):
+        self.rate = rate
+        self.burst = burst
+        self.max_rate = max_rate
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        # دالة الرسائل (المستخرج يمرر _log ليحترم الوضع الهادئ)
+        self.log = log
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    def _for_host(self, host: str) -> Tuple[TokenBucket, CircuitBreaker]:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst, max_rate=self.max_rate)
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._buckets[host], self._breakers[host]
+    
+    def request(self, url: str, send: Callable):
+        """إرسال طلب عبر محدد المعدل مع إعادة المحاولة عند الأخطاء المؤقتة"""
+        host = urlparse(url).netloc
+        bucket, breaker = self._for_host(host)
+        policy = self.retry_policy
+        
+        for attempt in range(policy.max_retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"تم إيقاف الطلبات مؤقتاً إلى {host} بعد تكرار الأخطاء")
+            bucket.acquire()
+            
+            try:
+                response = send()
+            except CLIENT_ERRORS:
+                raise
+            except policy.retry_exceptions:
+                breaker.record_failure()
+                if attempt >= policy.max_retries:
+                    raise
+                time.sleep(policy.delay(attempt))
+                continue
+            except Exception:
+                # كل طلب يسجل نتيجته حتى لا تبقى الدائرة نصف مفتوحة
+                breaker.record_failure()
+                raise
+            
+            if response.status_code not in policy.retry_statuses:
+                breaker.record_success()
+                bucket.reward()
+                return response
+            
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if response.status_code == 429:
+                bucket.penalize(retry_after)
+                breaker.record_throttled()
+            else:
+                breaker.record_failure()
+            
+            if attempt >= policy.max_retries:
+                return response
+            self.log(f"استجابة {response.status_code} من {host}، إعادة المحاولة ({attempt + 1}/{policy.max_retries})")
+            time.sleep(max(policy.delay(attempt), retry_after or 0))
+        
+        return response
+    
+    def stats(self) -> Dict[str, Dict]:
+        """المعدل الحالي وحالة الدائرة لكل نطاق"""
+        with self._lock:
+            return {host: {'rate': self._buckets[host].rate, 'circuit': self._breakers[host].state}
+                    for host in self._buckets}